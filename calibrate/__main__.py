@@ -24,11 +24,12 @@ def _run_detect(args) -> int:
     return detect_markers_from_camera(
         use_calibration=not args.no_calibration,
         calibration_file=args.calibration,
+        replay_source=args.replay,
     )
 
 
 def _run_take_photos(args) -> int:
-    return take_photos_from_camera(output_size=args.size)
+    return take_photos_from_camera(output_size=args.size, replay_source=args.replay)
 
 
 def _run_calibrate(_args) -> int:
@@ -43,6 +44,16 @@ COMMANDS = {
 }
 
 
+def _add_replay_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        type=Path,
+        default=None,
+        help="Replay frames from an image directory or video instead of the camera",
+    )
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="calibrate")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -61,6 +72,7 @@ def _build_parser() -> argparse.ArgumentParser:
         default=Path("camera.yml"),
         help="Path to camera.yml (default: ./camera.yml)",
     )
+    _add_replay_argument(detect)
 
     take = subparsers.add_parser(
         "take-photos",
@@ -73,6 +85,7 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Frame size e.g. 1920x1080. Default: full sensor resolution (Picamera2).",
     )
+    _add_replay_argument(take)
 
     subparsers.add_parser("calibrate", help="Calibrate camera from saved chessboard photos")
     return parser
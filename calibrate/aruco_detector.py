@@ -7,6 +7,7 @@ import cv2.aruco as aruco
 
 from calibrate.camera_params import load_camera_calibration, undistort_bgr_frame
 from services.camera import CameraService
+from services.replay_camera import ReplayCameraService
 
 DICT = aruco.DICT_4X4_50
 
@@ -99,6 +100,7 @@ def detect_markers_from_camera(
     square_crop: bool = False,
     calibration_file: Path | None = Path("camera.yml"),
     use_calibration: bool = True,
+    replay_source: Path | None = None,
 ) -> int:
     """Single high-quality capture → ArUco detection → show result. Any key closes the window."""
     calib = _load_calibration_if_enabled(use_calibration, calibration_file)
@@ -106,10 +108,12 @@ def detect_markers_from_camera(
     aruco_dict = aruco.getPredefinedDictionary(DICT)
     detector = aruco.ArucoDetector(aruco_dict, aruco.DetectorParameters())
 
-    with CameraService(
-        output_size=output_size,
-        square_crop=square_crop,
-    ) as cam:
+    if replay_source is not None:
+        camera = ReplayCameraService(replay_source, output_size=output_size, square_crop=square_crop)
+    else:
+        camera = CameraService(output_size=output_size, square_crop=square_crop)
+
+    with camera as cam:
         _, frame = cam.read()
 
     display = _process_frame(frame, detector, calib)
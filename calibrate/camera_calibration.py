@@ -6,6 +6,7 @@ import numpy as np
 from pathlib import Path
 
 from services.camera import CameraService
+from services.replay_camera import ReplayCameraService
 
 PHOTOS_DIR = Path("data/calibration/photos")
 OUTPUT_DIR = Path("data/calibration/undistorted")
@@ -23,6 +24,7 @@ def take_photos_from_camera(
     max_photos: int = 25,
     interval: float = 3.0,
     output_size: tuple[int, int] | None = None,
+    replay_source: Path | None = None,
 ) -> int:
     if output_dir.exists():
         shutil.rmtree(output_dir)
@@ -34,7 +36,12 @@ def take_photos_from_camera(
     print(f"Saving {max_photos} photos to '{output_dir}' every {interval}s. Press 'q' to stop early.")
 
     # output_size None = full sensor (Picamera2); pass e.g. (1920, 1080) for smaller/faster captures.
-    with CameraService(output_size=output_size) as cam:
+    if replay_source is not None:
+        camera = ReplayCameraService(replay_source, output_size=output_size)
+    else:
+        camera = CameraService(output_size=output_size)
+
+    with camera as cam:
         logged_size = False
         while frame_count < max_photos:
             _, frame = cam.read()
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+from services.camera import CameraService
+from services.replay_camera import ReplayCameraService
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCameraService:
+    """
+    Long-lived camera that keeps capturing on a background thread.
+
+    The wrapped camera is opened once (configuration, focus lock and ``warmup_time`` are paid
+    a single time) and every captured frame goes into a bounded ring buffer of
+    ``buffer_size`` ``(timestamp, frame)`` pairs. ``read()`` hands out the most recent frame
+    right away, so a solve never waits for camera start-up.
+
+    Captures are paced to at most one every ``frame_interval`` seconds and stop entirely
+    between ``pause()`` and ``resume()``, so the capture thread doesn't compete with a solve
+    for CPU and the GIL.
+
+    Capture errors are recovered on the background thread: the camera is released and a
+    new one is created via ``camera_factory`` after ``retry_delay`` seconds, without
+    restarting the process. Same ``open/read/release`` and context-manager interface as
+    :class:`CameraService`.
+    """
+
+    def __init__(
+        self,
+        camera_factory: Callable[[], CameraService | ReplayCameraService] = CameraService,
+        buffer_size: int = 2,
+        *,
+        retry_delay: float = 1.0,
+        read_timeout: float = 10.0,
+        frame_interval: float = 0.5,
+    ):
+        self._camera_factory = camera_factory
+        self._frames: deque[tuple[float, np.ndarray]] = deque(maxlen=buffer_size)
+        self._retry_delay = retry_delay
+        self._read_timeout = read_timeout
+        self._frame_interval = frame_interval
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        # cleared while paused, the capture thread waits on it
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread: threading.Thread | None = None
+        self._last_error: Exception | None = None
+
+    def open(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self) -> None:
+        while not self._stop.is_set():
+            camera = self._camera_factory()
+            try:
+                camera.open()
+                last_capture: float | None = None
+                while not self._stop.is_set():
+                    self._resumed.wait()
+                    if self._stop.is_set():
+                        break
+                    if last_capture is not None:
+                        remaining = last_capture + self._frame_interval - time.monotonic()
+                        if remaining > 0:
+                            self._stop.wait(remaining)
+                            continue
+                    last_capture = time.monotonic()
+                    success, frame = camera.read()
+                    if not success:
+                        raise RuntimeError("camera returned no frame")
+                    with self._condition:
+                        self._frames.append((time.monotonic(), frame))
+                        self._condition.notify_all()
+            except Exception as error:
+                self._last_error = error
+                logger.warning("Camera capture failed (%r), reopening in %ss", error, self._retry_delay)
+            finally:
+                try:
+                    camera.release()
+                except Exception:
+                    pass
+
+            self._stop.wait(self._retry_delay)
+
+    @property
+    def last_error(self) -> Exception | None:
+        """Most recent capture error the background thread recovered from, or ``None``."""
+        return self._last_error
+
+    def read(self, max_age: float | None = None) -> tuple[bool, np.ndarray | None]:
+        """
+        Returns (success, frame) of the most recent buffered frame.
+
+        With ``max_age`` (seconds) only a frame captured at most that long ago is accepted;
+        otherwise waits for the next capture. Returns ``(False, None)`` if no matching frame
+        arrives within ``read_timeout``.
+        """
+        deadline = time.monotonic() + self._read_timeout
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._frames:
+                    timestamp, frame = self._frames[-1]
+                    if max_age is None or now - timestamp <= max_age:
+                        return True, frame
+                if now >= deadline:
+                    return False, None
+                self._condition.wait(deadline - now)
+
+    def pause(self) -> None:
+        """Stops capturing until ``resume()``; buffered frames age while paused."""
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    def release(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._resumed.set()
+        self._thread.join()
+        self._thread = None
+        with self._condition:
+            self._frames.clear()
+
+    def __enter__(self) -> "BufferedCameraService":
+        self.open()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
@@ -22,6 +22,11 @@ class CameraService:
     IMX708 typically **4608×2592**, see :data:`RPI_CAMERA_MODULE3_IMX708_MAX_SIZE`).
     ``camera_params.undistort_bgr_frame`` scales intrinsics if ``camera.yml`` was recorded at
     a different resolution.
+
+    ``roi=(x, y, width, height)`` (full sensor pixels) crops on the ISP via ``ScalerCrop`` so
+    only that region is delivered, 1:1 unless ``output_size`` is given. ``luminance=True``
+    captures YUV420 and ``read()`` returns the Y plane as a single-channel frame, skipping
+    the colour conversion entirely.
     """
 
     def __init__(
@@ -34,7 +39,12 @@ class CameraService:
         exposure_value: float | None = 1.09,
         ae_metering: str | None = "spot",
         warmup_time: float = 2.0,
+        roi: tuple[int, int, int, int] | None = None,
+        luminance: bool = False,
     ):
+        if roi is not None and square_crop:
+            raise ValueError("roi and square_crop can't be combined")
+
         self._output_size = output_size
         self._square_crop = square_crop
         self._lens_position = lens_position
@@ -42,6 +52,8 @@ class CameraService:
         self._exposure_value = exposure_value
         self._ae_metering = ae_metering
         self._warmup_time = warmup_time
+        self._roi = roi
+        self._luminance = luminance
         self._cam = None
         self._configured_main_size: tuple[int, int] | None = None
 
@@ -60,8 +72,15 @@ class CameraService:
         sensor_full_size = full_mode["size"]
         main_size = self._output_size if self._output_size is not None else sensor_full_size
 
+        # ISP-Crop: nur die ROI wird skaliert und ausgeliefert, ungenutzte Megapixel werden nie allokiert.
+        if self._roi is not None and self._output_size is None:
+            main_size = (self._roi[2], self._roi[3])
+
+        # YUV420: Y-Ebene ist direkt das Graustufenbild, keine Farbkonvertierung nötig.
+        main_format = "YUV420" if self._luminance else "BGR888"
+
         config = cam.create_still_configuration(
-            main={"format": "BGR888", "size": main_size},
+            main={"format": main_format, "size": main_size},
             raw={"size": sensor_full_size},
             buffer_count=2,
         )
@@ -97,6 +116,8 @@ class CameraService:
             ctrl["ExposureValue"] = float(self._exposure_value)
         if self._ae_metering is not None:
             ctrl["AeMeteringMode"] = self._resolve_ae_metering(controls, self._ae_metering)
+        if self._roi is not None:
+            ctrl["ScalerCrop"] = tuple(int(v) for v in self._roi)
         return ctrl
 
     @staticmethod
@@ -124,7 +145,9 @@ class CameraService:
         """Returns (success, frame) — same interface as cv2.VideoCapture.read()."""
         frame = self._cam.capture_array()
 
-        if self._picamera_rgb_buffer:
+        if self._luminance:
+            frame = self._luminance_plane(frame)
+        elif self._picamera_rgb_buffer:
             frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
 
         if self._square_crop:
@@ -132,6 +155,12 @@ class CameraService:
 
         return True, frame
 
+    def _luminance_plane(self, frame: np.ndarray) -> np.ndarray:
+        """Y plane of a YUV420 array (Y rows stacked on top of the subsampled U/V rows, padded to stride)."""
+        height = frame.shape[0] * 2 // 3
+        width = self._configured_main_size[0] if self._configured_main_size is not None else frame.shape[1]
+        return frame[:height, :width]
+
     @staticmethod
     def _crop_square(frame: np.ndarray) -> np.ndarray:
         """Crops the center square from a frame."""
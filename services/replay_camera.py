@@ -0,0 +1,252 @@
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+# decoded frame stacks of memory-mapped replays, kept out of the source directory
+CACHE_DIR = Path(tempfile.gettempdir()) / "replay_camera"
+
+
+class ReplayCameraService:
+    """
+    File-backed drop-in for :class:`services.camera.CameraService` — no Picamera2 needed.
+
+    ``source`` is a directory of still images (replayed in name order) or a video file. Each
+    ``read()`` returns the next frame as BGR, like ``cv2.imread``; with ``loop=True`` the
+    replay wraps around, otherwise ``read()`` returns ``(False, None)`` at the end.
+
+    ``frame_interval`` (seconds) paces ``read()`` like a real camera; ``None`` replays as fast
+    as possible. ``memory_map=True`` decodes all frames once into an ``.npy`` file
+    (``cache_file``, default in :data:`CACHE_DIR`) and maps it on later runs, so replay costs no
+    image decoding. ``roi``, ``luminance``, ``output_size`` and ``square_crop`` are applied in
+    software with the same meaning as on :class:`CameraService`.
+    """
+
+    def __init__(
+        self,
+        source: Path | str,
+        output_size: tuple[int, int] | None = None,
+        square_crop: bool = False,
+        *,
+        frame_interval: float | None = None,
+        loop: bool = True,
+        memory_map: bool = False,
+        cache_file: Path | None = None,
+        roi: tuple[int, int, int, int] | None = None,
+        luminance: bool = False,
+    ):
+        if roi is not None and square_crop:
+            raise ValueError("roi and square_crop can't be combined")
+
+        self._source = Path(source)
+        self._output_size = output_size
+        self._square_crop = square_crop
+        self._frame_interval = frame_interval
+        self._loop = loop
+        self._memory_map = memory_map
+        self._cache_file = cache_file
+        self._roi = roi
+        self._luminance = luminance
+        self._image_paths: list[Path] = []
+        self._video: cv2.VideoCapture | None = None
+        self._frames: np.ndarray | None = None
+        self._index = 0
+        self._last_read_time: float | None = None
+        self._configured_main_size: tuple[int, int] | None = None
+        self._opened = False
+
+    def open(self, lock_focus: bool = True) -> None:
+        """Opens the source; ``lock_focus`` is accepted for interface compatibility only."""
+        if self._source.is_dir():
+            self._image_paths = sorted(p for p in self._source.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+            if not self._image_paths:
+                raise FileNotFoundError(f"No images found in '{self._source}'")
+        elif self._source.is_file():
+            if not self._memory_map:
+                self._open_video()
+        else:
+            raise FileNotFoundError(f"Replay source not found: '{self._source}'")
+
+        if self._memory_map:
+            self._frames = self._load_memory_map()
+
+        self._index = 0
+        self._last_read_time = None
+        self._opened = True
+
+    def _open_video(self) -> None:
+        video = cv2.VideoCapture(str(self._source))
+        if not video.isOpened():
+            raise FileNotFoundError(f"Could not open video '{self._source}'")
+        self._video = video
+
+    def _rewind_video(self) -> None:
+        if self._video is not None:
+            self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _default_cache_file(self) -> Path:
+        # one file per source path and content, the source directory stays untouched
+        digest = hashlib.sha1(f"{self._source.resolve()}\n{self._source_listing()}".encode()).hexdigest()[:16]
+        return CACHE_DIR / f"{self._source.name}-{digest}.npy"
+
+    def _source_listing(self) -> str:
+        # added, deleted, renamed or replaced files change the listing even if no mtime got newer
+        paths = self._image_paths if self._source.is_dir() else [self._source]
+        return "\n".join(f"{p.name}:{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in paths)
+
+    def _source_mtime(self) -> float:
+        if self._source.is_dir():
+            return max(p.stat().st_mtime for p in self._image_paths)
+        return self._source.stat().st_mtime
+
+    def _load_memory_map(self) -> np.ndarray:
+        """Maps the pre-decoded frame stack, decoding it first if missing or outdated."""
+        cache_file = self._cache_file if self._cache_file is not None else self._default_cache_file()
+
+        if not cache_file.is_file() or cache_file.stat().st_mtime < self._source_mtime() or not self._matches_source(cache_file):
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            frames = list(self._decode_all())
+            if not frames:
+                raise ValueError(f"No frames decoded from '{self._source}'")
+            if any(frame.shape != frames[0].shape for frame in frames):
+                raise ValueError(f"Frames in '{self._source}' differ in size, can't memory-map them")
+
+            stack = np.lib.format.open_memmap(cache_file, mode="w+", dtype=frames[0].dtype, shape=(len(frames), *frames[0].shape))
+            for i, frame in enumerate(frames):
+                stack[i] = frame
+            stack.flush()
+            del stack
+
+        return np.load(cache_file, mmap_mode="r")
+
+    def _matches_source(self, cache_file: Path) -> bool:
+        # an explicit cache_file isn't keyed by content, deleted images only show in the frame count
+        if not self._source.is_dir():
+            return True
+        try:
+            return len(np.load(cache_file, mmap_mode="r")) == len(self._image_paths)
+        except (OSError, ValueError):
+            return False
+
+    def _decode_all(self):
+        if self._source.is_dir():
+            for path in self._image_paths:
+                frame = cv2.imread(str(path))
+                if frame is None:
+                    raise ValueError(f"Could not decode '{path}'")
+                yield frame
+            return
+
+        video = cv2.VideoCapture(str(self._source))
+        try:
+            while True:
+                success, frame = video.read()
+                if not success:
+                    return
+                yield frame
+        finally:
+            video.release()
+
+    @property
+    def configured_main_size(self) -> tuple[int, int] | None:
+        """``(width, height)`` of the delivered frames after the first ``read()``, or ``None``."""
+        return self._configured_main_size
+
+    @property
+    def frame_count(self) -> int | None:
+        """Number of frames in the source, or ``None`` for a video without memory map."""
+        if self._frames is not None:
+            return len(self._frames)
+        if self._image_paths:
+            return len(self._image_paths)
+        return None
+
+    def read(self) -> tuple[bool, np.ndarray | None]:
+        """Returns (success, frame) — same interface as cv2.VideoCapture.read()."""
+        if not self._opened:
+            return False, None
+
+        self._pace()
+
+        frame = self._next_raw_frame()
+        if frame is None and self._loop and self._index > 0:
+            self._index = 0
+            self._rewind_video()
+            frame = self._next_raw_frame()
+        if frame is None:
+            return False, None
+
+        frame = self._postprocess(frame)
+        h, w = frame.shape[:2]
+        self._configured_main_size = (w, h)
+        return True, frame
+
+    def _pace(self) -> None:
+        if self._frame_interval is not None and self._last_read_time is not None:
+            remaining = self._last_read_time + self._frame_interval - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_read_time = time.monotonic()
+
+    def _next_raw_frame(self) -> np.ndarray | None:
+        if self._frames is not None:
+            if self._index >= len(self._frames):
+                return None
+            frame = self._frames[self._index]
+        elif self._video is not None:
+            success, frame = self._video.read()
+            if not success:
+                return None
+        else:
+            if self._index >= len(self._image_paths):
+                return None
+            frame = cv2.imread(str(self._image_paths[self._index]))
+            if frame is None:
+                raise ValueError(f"Could not decode '{self._image_paths[self._index]}'")
+
+        self._index += 1
+        return frame
+
+    def _postprocess(self, frame: np.ndarray) -> np.ndarray:
+        if self._roi is not None:
+            x, y, w, h = self._roi
+            frame = frame[y:y + h, x:x + w]
+        if self._output_size is not None:
+            frame = cv2.resize(frame, self._output_size, interpolation=cv2.INTER_AREA)
+        if self._luminance:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._square_crop:
+            frame = self._crop_square(frame)
+        # memory-mapped frames are read-only views, hand out a private copy (only the ROI pages are touched)
+        return np.ascontiguousarray(frame) if frame.flags.writeable else frame.copy()
+
+    @staticmethod
+    def _crop_square(frame: np.ndarray) -> np.ndarray:
+        """Crops the center square from a frame."""
+        h, w = frame.shape[:2]
+        if w > h:
+            x = (w - h) // 2
+            return frame[:, x:x + h]
+        elif h > w:
+            y = (h - w) // 2
+            return frame[y:y + w, :]
+        return frame
+
+    def release(self) -> None:
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self._frames = None
+        self._opened = False
+        self._configured_main_size = None
+
+    def __enter__(self) -> "ReplayCameraService":
+        self.open()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
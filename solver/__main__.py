@@ -1,22 +1,25 @@
-import sys
+import argparse
 
 import cv2
 
 from solver.debugger import Debugger
+from solver.models.solve_options import SolveOptions
+from solver.pipeline.contour_detector import STRATEGIES, STRATEGY_EXHAUSTIVE, ContourDetector
+from solver.pipeline.matcher import RASTER_CELL_PIXEL, RASTER_CELL_SUGGESTED_PIXEL, SEARCH_STRATEGIES, SEARCH_STRATEGY_DEPTH_FIRST
 from solver.puzzle import Puzzle
 from solver.uart_handler import UartHandler
 
 UART_PORT = '/dev/ttyAMA4'
 
-def prod():
-	UartHandler(UART_PORT)
+def prod(port: str, options: SolveOptions):
+	UartHandler(port, options=options)
 
-def test():
+def test(port: str, options: SolveOptions):
 	Debugger.enable_log()
 	Debugger.enable_image_save()
-	UartHandler(UART_PORT)
+	UartHandler(port, options=options)
 
-def debug(path: str):
+def debug(path: str, options: SolveOptions):
 	Debugger.enable_log()
 	Debugger.enable_plot()
 
@@ -25,18 +28,66 @@ def debug(path: str):
 	if image is None:
 		raise FileNotFoundError(f"Image not found: {path}")
 
-	solution = Puzzle.solve(image)
+	# deliver the image like a roi capture of the camera would
+	if options.roi_capture:
+		image = cv2.cvtColor(ContourDetector.crop(image), cv2.COLOR_BGR2GRAY)
+
+	solution = Puzzle.solve(image, options)
 
 	if solution is not None:
 		Debugger.log("Uart messages:\n")
 		for message in UartHandler.get_piece_messages(solution.pieces):
 			Debugger.log(message)
 
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(prog="solver")
+	parser.add_argument("image", nargs="?", help="Solve a single image in debug mode")
+	parser.add_argument("--test", action="store_true", help="Run the uart handler with logging and image saving")
+	parser.add_argument("--port", default=UART_PORT, help="Serial device or pyserial url of the uart handler")
+	parser.add_argument("--threshold-strategy", choices=STRATEGIES, default=STRATEGY_EXHAUSTIVE, help="Contour threshold selection")
+	parser.add_argument("--threshold-workers", type=int, default=1, help="Threads evaluating contour thresholds concurrently")
+	parser.add_argument("--pyramid-levels", type=int, default=0, help="Sweep contour thresholds on a downscaled image (0 = full resolution)")
+	parser.add_argument("--warm-start", action="store_true", help="Try cached thresholds of similar lighting first")
+	parser.add_argument("--roi-capture", action="store_true", help="Capture only the A4 area as grayscale")
+	parser.add_argument("--persistent-camera", action="store_true", help="Keep the camera open and capture frames in the background")
+	parser.add_argument("--replay", metavar="PATH", default=None, help="Replay frames from an image directory or video instead of the camera")
+	parser.add_argument("--replay-interval", type=float, default=None, help="Seconds between replayed frames (default replays as fast as possible)")
+	parser.add_argument("--replay-memory-map", action="store_true", help="Decode the replay once and memory-map the frames on later runs")
+	parser.add_argument("--matcher-workers", type=int, default=1, help="Processes searching matcher branches in parallel")
+	parser.add_argument("--matcher-budget", type=float, default=None, help="Seconds the matcher may search before returning its best solution so far")
+	parser.add_argument("--matcher-raster-cell", type=float, default=RASTER_CELL_PIXEL, help=f"Cell size in pixels of the inexact matcher overlap pre-filter, e.g. {RASTER_CELL_SUGGESTED_PIXEL:g} (default off, exact scoring only)")
+	parser.add_argument("--matcher-strategy", choices=SEARCH_STRATEGIES, default=SEARCH_STRATEGY_DEPTH_FIRST, help="Matcher search engine")
+	parser.add_argument("--matcher-beam-width", type=int, default=None, help="Partial assemblies kept by the best first matcher (default keeps all)")
+	parser.add_argument("--piece-counts", type=int, nargs="+", default=None, help="Piece counts a contour result may have (default 4 6)")
+
+	return parser
+
+def build_options(args: argparse.Namespace) -> SolveOptions:
+	return SolveOptions(
+		threshold_strategy=args.threshold_strategy,
+		threshold_workers=args.threshold_workers,
+		pyramid_levels=args.pyramid_levels,
+		warm_start=args.warm_start,
+		roi_capture=args.roi_capture,
+		persistent_camera=args.persistent_camera,
+		replay_source=args.replay,
+		replay_interval=args.replay_interval,
+		replay_memory_map=args.replay_memory_map,
+		matcher_workers=args.matcher_workers,
+		matcher_budget=args.matcher_budget,
+		matcher_raster_cell=args.matcher_raster_cell or None,
+		matcher_strategy=args.matcher_strategy,
+		matcher_beam_width=args.matcher_beam_width,
+		piece_counts=args.piece_counts,
+	)
+
 if __name__ == "__main__":
-	if len(sys.argv) >= 2:
-		if (sys.argv[1] == '--test'):
-			test()
-		else:
-			debug(sys.argv[1])
+	args = build_parser().parse_args()
+	options = build_options(args)
+
+	if args.test:
+		test(args.port, options)
+	elif args.image is not None:
+		debug(args.image, options)
 	else:
-		prod()
+		prod(args.port, options)
@@ -24,4 +24,8 @@ A5_HEIGHT_MICROMETER = 124_000
 
 # inferred
 PIECE_MARGIN_PIXEL = PIECE_MARGIN_MICROMETER / PIXEL_TO_MICROMETER_FACTOR
-A5_AREA_PIXEL = A5_WIDTH_MICROMETER * A5_HEIGHT_MICROMETER / PIXEL_TO_MICROMETER_FACTOR
+A4_WIDTH_PIXEL = int(A4_WIDTH_MICROMETER / PIXEL_TO_MICROMETER_FACTOR)
+A4_HEIGHT_PIXEL = int(A4_HEIGHT_MICROMETER / PIXEL_TO_MICROMETER_FACTOR)
+# (x, y, width, height) of the A4 area in camera pixels
+A4_ROI_PIXEL = (A4_OFFSET_LEFT_PIXEL, A4_OFFSET_TOP_PIXEL, A4_WIDTH_PIXEL, A4_HEIGHT_PIXEL)
+A5_AREA_PIXEL = A5_WIDTH_MICROMETER * A5_HEIGHT_MICROMETER / PIXEL_TO_MICROMETER_FACTOR ** 2
@@ -32,15 +32,23 @@ class Debugger:
 		print(message)
 
 	@staticmethod
-	def plot(image, pieces: List[Piece]):
+	def plot(image, pieces: List[Piece], cropped: bool = False):
 		if not Debugger.__plot_enabled:
 			return
 
 		solved_color=(0, 150, 255)
 		solved_color_edge=(255, 0, 255)
 
+		if image.ndim == 2:
+			image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
 		plot = Plot()
-		plot.add_image(image, PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_LEFT_MICROMETER - A4_OFFSET_LEFT_PIXEL * PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_TOP_MICROMETER - A4_OFFSET_TOP_PIXEL * PIXEL_TO_MICROMETER_FACTOR)
+
+		# cropped images start at the A4 frame instead of the camera origin
+		if cropped:
+			plot.add_image(image, PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_LEFT_MICROMETER, A4_OFFSET_TOP_MICROMETER)
+		else:
+			plot.add_image(image, PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_LEFT_MICROMETER - A4_OFFSET_LEFT_PIXEL * PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_TOP_MICROMETER - A4_OFFSET_TOP_PIXEL * PIXEL_TO_MICROMETER_FACTOR)
 
 		frame = box(A4_OFFSET_LEFT_MICROMETER, A4_OFFSET_TOP_MICROMETER, A4_OFFSET_LEFT_MICROMETER + A4_WIDTH_MICROMETER, A4_OFFSET_TOP_MICROMETER + A4_HEIGHT_MICROMETER)
 		plot.add_polygon(frame)
@@ -2,6 +2,8 @@ from shapely import Point
 
 
 class Cursor:
-	def __init__(self, point: Point, angle_degrees: float):
+	def __init__(self, point: Point, angle_degrees: float, widened: bool = False):
 		self.point = point
 		self.angle_degrees = angle_degrees
+		# moved along an edge that only became a candidate in the current widening step
+		self.widened = widened
@@ -1,35 +1,50 @@
-
-import math
+from typing import TYPE_CHECKING
 from shapely import LineString
 
+if TYPE_CHECKING:
+	from solver.models.edge_table import EdgeTable
+
 
 class Edge:
+	# thin view over one row of an EdgeTable
+	__slots__ = ("__table", "__index")
+
 	@property
 	def startX(self) -> float:
-		return self.line.coords[0][0]
+		return self.__table.points[self.__index, 0, 0]
 
 	@property
 	def startY(self) -> float:
-		return self.line.coords[0][1]
+		return self.__table.points[self.__index, 0, 1]
 
 	@property
 	def endX(self) -> float:
-		return self.line.coords[-1][0]
+		return self.__table.points[self.__index, 1, 0]
 
 	@property
 	def endY(self) -> float:
-		return self.line.coords[-1][1]
+		return self.__table.points[self.__index, 1, 1]
 
 	@property
 	def length(self) -> float:
-		return self.line.length
+		return self.__table.lengths[self.__index]
 
 	@property
 	def angle_degrees(self) -> float:
-		# current angle of the edge (degrees)
-		# y is inverted
-		return (math.degrees(math.atan2(self.startY - self.endY, self.endX - self.startX)) + 360) % 360
+		return self.__table.angles[self.__index]
+
+	@property
+	def is_frame_edge(self) -> bool:
+		return bool(self.__table.is_frame_edge[self.__index])
+
+	@property
+	def tier(self) -> int:
+		return int(self.__table.tiers[self.__index])
+
+	@property
+	def line(self) -> LineString:
+		return LineString(self.__table.points[self.__index])
 
-	def __init__(self, line: LineString, is_frame_edge: bool):
-		self.line = line
-		self.is_frame_edge = is_frame_edge
+	def __init__(self, table: "EdgeTable", index: int):
+		self.__table = table
+		self.__index = index
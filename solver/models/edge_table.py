@@ -0,0 +1,88 @@
+import math
+from typing import Iterator, Optional, Tuple
+import numpy as np
+
+from solver.models.edge import Edge
+
+
+# edge candidate tiers, the matcher widens its candidates tier by tier
+EDGE_TIER_FRAME = 0
+# not intersecting the piece, but shorter than a frame edge
+EDGE_TIER_SHORT = 1
+# long enough, but its extension cuts through the piece
+EDGE_TIER_INTERSECTING = 2
+EDGE_TIER_ANY = 3
+EDGE_TIERS = [EDGE_TIER_FRAME, EDGE_TIER_SHORT, EDGE_TIER_INTERSECTING, EDGE_TIER_ANY]
+
+class EdgeTable:
+	# columnar storage of all edges of one piece
+	# points are (edge, start/end, x/y), every other column has one entry per edge
+	def __init__(self, points: np.ndarray, tiers: np.ndarray, lengths: Optional[np.ndarray] = None, angles: Optional[np.ndarray] = None):
+		self.points = points
+		self.tiers = tiers
+		self.is_frame_edge = tiers == EDGE_TIER_FRAME
+
+		# rotated copies pass the columns of the rotation they were cached with
+		if lengths is None or angles is None:
+			starts = points[:, 0]
+			ends = points[:, 1]
+			delta = ends - starts
+
+		self.lengths = np.hypot(delta[:, 0], delta[:, 1]) if lengths is None else lengths
+		# current angle of each edge (degrees)
+		# y is inverted
+		self.angles = (np.degrees(np.arctan2(-delta[:, 1], delta[:, 0])) + 360) % 360 if angles is None else angles
+
+	def __len__(self) -> int:
+		return len(self.points)
+
+	def __getitem__(self, index: int) -> Edge:
+		if not -len(self.points) <= index < len(self.points):
+			raise IndexError("edge index out of range")
+
+		return Edge(self, index % len(self.points))
+
+	def __iter__(self) -> Iterator[Edge]:
+		return (Edge(self, index) for index in range(len(self.points)))
+
+	def sorted_by_length(self) -> "EdgeTable":
+		# longest first, stable for equal lengths
+		order = np.argsort(-self.lengths, kind="stable")
+
+		return EdgeTable(self.points[order], self.tiers[order], self.lengths[order])
+
+	def transform(self, matrix: np.ndarray) -> "EdgeTable":
+		# the tiers never change and are shared
+		return EdgeTable(EdgeTable.transform_points(self.points, matrix), self.tiers)
+
+	@staticmethod
+	def transform_points(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+		# apply a 2x3 affine matrix to an array of (..., x/y) points
+		x = points[..., 0]
+		y = points[..., 1]
+
+		return np.stack((matrix[0, 0] * x + matrix[0, 1] * y + matrix[0, 2], matrix[1, 0] * x + matrix[1, 1] * y + matrix[1, 2]), axis=-1)
+
+	def following(self) -> np.ndarray:
+		# index of the edge starting where each edge ends
+		# edges are the sides of one outline, but sorted, so the neighbors are found again by their shared points
+		starts = {tuple(start): index for index, start in enumerate(self.points[:, 0].tolist())}
+		return np.array([starts.get(tuple(end), index) for index, end in enumerate(self.points[:, 1].tolist())], dtype=np.intp)
+
+	def orientation(self) -> float:
+		# sign of the outline area, positive if the inside is right of every edge (y is inverted)
+		return math.copysign(1.0, float((self.points[:, 0, 0] * self.points[:, 1, 1] - self.points[:, 1, 0] * self.points[:, 0, 1]).sum()))
+
+	def interior_angles(self) -> Tuple[np.ndarray, np.ndarray]:
+		# outline angle (degrees) at the start and at the end of each edge, measured inside the piece
+		following = self.following()
+		delta = self.points[:, 1] - self.points[:, 0]
+		following_delta = delta[following]
+
+		turns = np.degrees(np.arctan2(delta[:, 0] * following_delta[:, 1] - delta[:, 1] * following_delta[:, 0], (delta * following_delta).sum(axis=1)))
+		end_angles = 180.0 - self.orientation() * turns
+
+		preceding = np.empty_like(following)
+		preceding[following] = np.arange(len(following))
+
+		return end_angles[preceding], end_angles
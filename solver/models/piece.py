@@ -1,38 +1,83 @@
-from typing import List, Optional
+import math
+from typing import Optional, Tuple
+import numpy as np
 from shapely import Polygon
-from shapely.affinity import rotate, translate
 
 from solver.models.cursor import Cursor
-from solver.models.edge import Edge
+from solver.models.edge_table import EdgeTable
 from solver.models.placed_piece import PlacedPiece
+from solver.models.placement_cache import PlacementCache
 
 
 class Piece:
-	def __init__(self, polygon: Polygon, edges: List[Edge]):
+	def __init__(self, polygon: Polygon, edges: EdgeTable):
 		self.polygon = polygon
 		self.edges = edges
 		self.placed_piece: Optional[PlacedPiece] = None
+		# edges rotated for earlier placements, cleared by the matcher per solve
+		self.placement_cache = PlacementCache()
 
 	def place(self, edge_index: int, cursor: Cursor):
-		current_edge = self.edges[edge_index]
-		x_offset = cursor.point.x - current_edge.startX
-		y_offset = cursor.point.y - current_edge.startY
+		# rotation needed to match desired direction
+		rotation_degrees = float(self.edges.angles[edge_index]) - cursor.angle_degrees
+		rotation = self.placement_cache.get(edge_index, rotation_degrees)
+
+		if rotation is None:
+			cos, sin = Piece.__rotation(rotation_degrees)
+			rotated = EdgeTable(EdgeTable.transform_points(self.edges.points, np.array(((cos, -sin, 0.0), (sin, cos, 0.0)))), self.edges.tiers)
+			rotation = (rotation_degrees, cos, sin, rotated.points, rotated.angles, rotated.lengths)
+			self.placement_cache.put(edge_index, rotation)
+
+		_, cos, sin, points, angles, lengths = rotation
+
+		# move the rotated edge start onto the cursor
+		start_x, start_y = points[edge_index, 0].tolist()
+		offset_x = cursor.point.x - start_x
+		offset_y = cursor.point.y - start_y
+		matrix = np.array(((cos, -sin, offset_x), (sin, cos, offset_y)))
+
+		self.placed_piece = PlacedPiece(self.polygon, matrix, EdgeTable(points + (offset_x, offset_y), self.edges.tiers, lengths, angles), rotation_degrees)
+
+	def placement_matrix(self, edge_index: int, cursor: Cursor) -> np.ndarray:
+		start_x, start_y = self.edges.points[edge_index, 0].tolist()
 
 		# rotation needed to match desired direction
-		rotation_degrees = current_edge.angle_degrees - cursor.angle_degrees
+		rotation_degrees = float(self.edges.angles[edge_index]) - cursor.angle_degrees
+		cos, sin = Piece.__rotation(rotation_degrees)
+
+		# rotate around the edge start, then move the edge start onto the cursor
+		return np.array((
+			(cos, -sin, cursor.point.x - (cos * start_x - sin * start_y)),
+			(sin, cos, cursor.point.y - (sin * start_x + cos * start_y)),
+		))
 
-		rotated_polygon = rotate(self.polygon, rotation_degrees, origin=(current_edge.startX, current_edge.startY), use_radians=False)
-		placed_polygon = translate(rotated_polygon, x_offset, y_offset)
+	def placement_matrices(self, edge_indices: np.ndarray, points: np.ndarray, angles_degrees: np.ndarray) -> np.ndarray:
+		# placement_matrix of many cursors at once, given as (n, x/y) points and n angles
+		starts = self.edges.points[edge_indices, 0]
+		rotation_radians = (self.edges.angles[edge_indices] - angles_degrees) * math.pi / 180.0
+		cos = np.cos(rotation_radians)
+		sin = np.sin(rotation_radians)
+		cos[np.abs(cos) < 2.5e-16] = 0.0
+		sin[np.abs(sin) < 2.5e-16] = 0.0
 
-		placed_edges: List[Edge] = []
+		return np.stack((
+			np.stack((cos, -sin, points[:, 0] - (cos * starts[:, 0] - sin * starts[:, 1])), axis=-1),
+			np.stack((sin, cos, points[:, 1] - (sin * starts[:, 0] + cos * starts[:, 1])), axis=-1),
+		), axis=1)
 
-		for edge in self.edges:
-			rotated_line = rotate(edge.line, rotation_degrees, origin=(current_edge.startX, current_edge.startY), use_radians=False)
-			placed_line = translate(rotated_line, x_offset, y_offset)
+	@staticmethod
+	def __rotation(rotation_degrees: float) -> Tuple[float, float]:
+		# cos/sin are snapped like shapely.affinity.rotate so right angles stay exact
+		rotation_radians = rotation_degrees * math.pi / 180.0
+		cos = math.cos(rotation_radians)
+		sin = math.sin(rotation_radians)
 
-			placed_edges.append(Edge(placed_line, edge.is_frame_edge))
+		if abs(cos) < 2.5e-16:
+			cos = 0.0
+		if abs(sin) < 2.5e-16:
+			sin = 0.0
 
-		self.placed_piece = PlacedPiece(placed_polygon, placed_edges, rotation_degrees)
+		return cos, sin
 
 	def reset(self):
 		self.placed_piece = None
@@ -1,11 +1,32 @@
-from typing import List
+from typing import Optional
+import numpy as np
+import shapely
 from shapely import Polygon
 
-from solver.models.edge import Edge
+from solver.models.edge_table import EdgeTable
 
 
 class PlacedPiece:
-	def __init__(self, polygon: Polygon, edges: List[Edge], rotation_degrees: float):
-		self.polygon = polygon
+	# compact record, one is created for every node of the matcher search
+	# shapely geometry is only built when scoring or plotting needs it
+	__slots__ = ("matrix", "edges", "rotation_degrees", "__source", "__polygon")
+
+	@property
+	def polygon(self) -> Polygon:
+		if self.__polygon is None:
+			self.__polygon = shapely.transform(self.__source, lambda coords: EdgeTable.transform_points(coords, self.matrix))
+
+		return self.__polygon
+
+	@polygon.setter
+	def polygon(self, polygon: Polygon):
+		self.__polygon = polygon
+
+	def __init__(self, source: Polygon, matrix: np.ndarray, edges: EdgeTable, rotation_degrees: float):
+		self.__source = source
+		self.__polygon: Optional[Polygon] = None
+		# 2x3 affine matrix from piece to placed coordinates
+		self.matrix = matrix
 		self.edges = edges
 		self.rotation_degrees = rotation_degrees
+
@@ -0,0 +1,10 @@
+class Placement:
+	# everything needed to repeat one Piece.place call
+	__slots__ = ("piece_index", "edge_index", "x", "y", "angle_degrees")
+
+	def __init__(self, piece_index: int, edge_index: int, x: float, y: float, angle_degrees: float):
+		self.piece_index = piece_index
+		self.edge_index = edge_index
+		self.x = x
+		self.y = y
+		self.angle_degrees = angle_degrees
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+
+
+CACHE_SIZE = 256
+
+# (edge index, exact rotation degrees), placements stay bit for bit the same as uncached ones
+RotationKey = Tuple[int, float]
+# (rotation degrees, cos, sin, rotated edge points, rotated edge angles, rotated edge lengths)
+Rotation = Tuple[float, float, float, np.ndarray, np.ndarray, np.ndarray]
+
+class PlacementCache:
+	# rotated edges of one piece, a placement at a cached rotation only adds the translation
+	# the search places the same edge at the same cursor angle many times, cursor angles are mostly multiples of 90 degrees
+	def __init__(self, size: int = CACHE_SIZE):
+		self.__size = size
+		# least recently used rotation first
+		self.__entries: OrderedDict[RotationKey, Rotation] = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self) -> int:
+		return len(self.__entries)
+
+	def get(self, edge_index: int, rotation_degrees: float) -> Optional[Rotation]:
+		key = (edge_index, rotation_degrees)
+		rotation = self.__entries.get(key)
+
+		if rotation is None:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		self.__entries.move_to_end(key)
+
+		return rotation
+
+	def put(self, edge_index: int, rotation: Rotation):
+		key = (edge_index, rotation[0])
+		self.__entries[key] = rotation
+		self.__entries.move_to_end(key)
+
+		if len(self.__entries) > self.__size:
+			self.__entries.popitem(last=False)
+
+	def clear(self):
+		self.__entries.clear()
+		self.hits = 0
+		self.misses = 0
@@ -3,6 +3,8 @@ from solver.models.piece import Piece
 
 
 class Solution:
-	def __init__(self, pieces: List[Piece], score: float):
+	def __init__(self, pieces: List[Piece], score: float, complete: bool = True):
 		self.pieces = pieces
 		self.score = score
+		# false if the matcher ran out of budget before the search finished
+		self.complete = complete
@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from solver.pipeline.contour_detector import STRATEGY_EXHAUSTIVE
+from solver.pipeline.matcher import RASTER_CELL_PIXEL, SEARCH_STRATEGY_DEPTH_FIRST
+import solver.constants as constants
+
+
+class SolveOptions:
+	def __init__(
+		self,
+		threshold_strategy: str = STRATEGY_EXHAUSTIVE,
+		threshold_workers: int = 1,
+		pyramid_levels: int = 0,
+		warm_start: bool = False,
+		roi_capture: bool = False,
+		persistent_camera: bool = False,
+		replay_source: Optional[str] = None,
+		replay_interval: Optional[float] = None,
+		replay_memory_map: bool = False,
+		matcher_workers: int = 1,
+		matcher_budget: Optional[float] = None,
+		matcher_raster_cell: Optional[float] = RASTER_CELL_PIXEL,
+		matcher_strategy: str = SEARCH_STRATEGY_DEPTH_FIRST,
+		matcher_beam_width: Optional[int] = None,
+		piece_counts: Optional[List[int]] = None,
+	):
+		self.threshold_strategy = threshold_strategy
+		self.threshold_workers = threshold_workers
+		self.pyramid_levels = pyramid_levels
+		self.warm_start = warm_start
+		# capture only the A4 area as grayscale instead of the full color frame
+		self.roi_capture = roi_capture
+		# keep the camera open between solves and capture in the background
+		self.persistent_camera = persistent_camera
+		# replay frames from an image directory or video instead of the camera
+		self.replay_source = replay_source
+		# seconds between replayed frames like a real camera, None replays as fast as possible
+		self.replay_interval = replay_interval
+		# decode the replay once into a memory-mapped frame stack
+		self.replay_memory_map = replay_memory_map
+		# processes searching matcher branches, 1 searches in this process
+		self.matcher_workers = matcher_workers
+		# seconds the matcher may search before returning its best solution so far, None is unlimited
+		self.matcher_budget = matcher_budget
+		# cell size in pixels of the matcher overlap pre-filter, None scores every placement exactly
+		self.matcher_raster_cell = matcher_raster_cell
+		self.matcher_strategy = matcher_strategy
+		# partial assemblies kept by the best first search, None keeps all
+		self.matcher_beam_width = matcher_beam_width
+		# piece counts a contour result may have, more pieces need the border first matcher
+		self.piece_counts = list(constants.PIECE_COUNTS) if piece_counts is None else piece_counts
@@ -0,0 +1,570 @@
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple, cast
+import numpy as np
+import shapely
+from shapely import Point, Polygon, box
+from shapely.geometry.polygon import orient
+
+from solver.debugger import Debugger
+from solver.models.cursor import Cursor
+from solver.models.edge_table import EDGE_TIER_INTERSECTING, EdgeTable
+from solver.models.piece import Piece
+from solver.models.solution import Solution
+from solver.pipeline.edge_compatibility import EdgeCompatibility
+from solver.pipeline.placement_scorer import PlacementScorer
+from solver.pipeline.raster_scorer import RasterScorer
+from solver.pipeline.piece_detector import EDGE_SIMPLIFY_TOLERANCE, SHORT_EDGE_LENGTH
+import solver.constants as constants
+
+
+A5_WIDTH_PIXEL = constants.A5_WIDTH_MICROMETER / constants.PIXEL_TO_MICROMETER_FACTOR
+A5_HEIGHT_PIXEL = constants.A5_HEIGHT_MICROMETER / constants.PIXEL_TO_MICROMETER_FACTOR
+# frame sides are walked clockwise with the frame inside on the right: right, down, left, up (y is inverted)
+SIDE_ANGLES = [0.0, 270.0, 180.0, 90.0]
+# the sheet corners of the test captures turn within 4 degrees of a right angle, cut corners of jittered grids often within 15
+CORNER_ANGLE_TOLERANCE_DEGREES = 6.0
+# corner pieces are widened like the matcher's edge tiers, the pieces closest to a right angle first, then every candidate
+CORNER_PIECE_COUNT = 4
+# rounded piece corners leave short edges between the two frame edges
+CORNER_BRIDGE_PIXEL = 40.0
+# pieces on one side may cover the A5 side length this much shorter or longer
+SIDE_LENGTH_TOLERANCE = 0.06
+# straight stretches of a cut can look like frame edges, the whole piece lies inside a frame edge up to this distance
+FRAME_EDGE_OUTSIDE_PIXEL = 10.0
+# a neighbor coming closer than this share of the piece gap is penalized by the weight,
+# a neighbor staying within the far share along its whole cut is rewarded
+NEIGHBOR_NEAR_GAP = 0.75
+NEIGHBOR_FAR_GAP = 1.5
+NEIGHBOR_NEAR_WEIGHT = 10.0
+# interior poses are ranked on sample points this far apart, the best ones are measured exactly
+# every pose is ranked on the coarse samples first, only the best of them on the fine ones
+INTERIOR_COARSE_SAMPLE_PIXEL = 32.0
+INTERIOR_COARSE_POSES = 128
+INTERIOR_SAMPLE_PIXEL = 16.0
+INTERIOR_EXACT_POSES = 16
+# deviations from the best fitting neighbor along the whole frame
+MAX_DISCREPANCIES = 6
+# perimeter placements tried per first corner and frame orientation
+PERIMETER_NODE_LIMIT = 500
+# seconds the frame search may take without a deadline, the best frame so far is used after it
+# 24 pieces lay their frame in 0.7-1.0 s on a development machine, slower boards stay within a few seconds
+PERIMETER_BUDGET = 2.0
+
+# (piece index, edge index, extent along the side)
+BorderOption = Tuple[int, int, float]
+# (piece index, incoming edge index, outgoing edge index, extent on the incoming side, outgoing edge offset from the corner, extent on the outgoing side,
+#  lengths of the whole sides in between for pieces around several corners)
+CornerOption = Tuple[int, int, int, float, float, float, Tuple[float, ...]]
+# (piece index, edge index, cursor) to rebuild a placement
+Step = Tuple[int, int, Cursor]
+
+class BorderAssembler:
+	# assembles frame puzzles of any size without the factorial search
+	# corner and border pieces are classified by their frame edges and laid out along the frame sides first
+	# the remaining pieces are then fitted into the hole left in the middle, largest first
+	def __init__(self, pieces: List[Piece], deadline: Optional[float] = None):
+		self.__pieces = pieces
+		self.__orientations = [piece.edges.orientation() for piece in pieces]
+		self.__compatibility = EdgeCompatibility(pieces)
+		# wall clock time (time.time) the frame search stops at, the perimeter budget bounds it without one
+		self.__deadline = time.time() + PERIMETER_BUDGET if deadline is None else deadline
+		self.__timed_out = False
+
+		self.__borders: List[BorderOption] = []
+		# every corner found, and the smallest deviation from a right angle of each piece with one
+		self.__candidate_corners: List[CornerOption] = []
+		self.__corner_errors: Dict[int, float] = {}
+
+		for piece_index, piece in enumerate(pieces):
+			for edge_index in self.__frame_edges(piece_index):
+				self.__borders.append((piece_index, edge_index, float(piece.edges.lengths[edge_index])))
+
+			self.__candidate_corners.extend(self.__find_corners(piece_index))
+
+		# fits of neighbor pairs and the zones around the first of them, neither depends on where the pieces lie on the frame
+		self.__neighbor_zones: Dict[Tuple[int, int], Tuple[Polygon, Polygon]] = {}
+		self.__fits: Dict[Tuple[int, int, Optional[BorderOption], Optional[CornerOption]], float] = {}
+
+		self.__classify(set(self.__corner_errors))
+
+		self.__scorer = PlacementScorer(len(pieces), local_unions=True)
+		self.__used = [False] * len(pieces)
+		self.__steps: List[Step] = []
+		self.__best_steps: Optional[List[Step]] = None
+		self.__best_cost = float("inf")
+		self.__nodes = 0
+		self.__start_nodes = 0
+		# (side, used pieces) already extended, the order pieces were laid on a side in doesn't change what still fits
+		self.__visited: Set[Tuple[int, Tuple[bool, ...]]] = set()
+
+	def __classify(self, corner_pieces: Set[int]):
+		# corner pieces lie around frame corners, every other piece with a frame edge along a single side
+		self.__corner_pieces = corner_pieces
+		self.__corners = [corner for corner in self.__candidate_corners if corner[0] in corner_pieces]
+
+		# shortest and longest frame length every piece can cover with the piece gap before it, corners on two sides
+		self.__min_material = [0.0] * len(self.__pieces)
+		self.__max_material = [0.0] * len(self.__pieces)
+
+		for piece_index in range(len(self.__pieces)):
+			extents = [corner[3] + sum(corner[6]) + corner[5] for corner in self.__corners if corner[0] == piece_index] or [border[2] for border in self.__borders if border[0] == piece_index]
+
+			if extents:
+				self.__min_material[piece_index] = min(extents) + constants.PIECE_MARGIN_PIXEL
+				self.__max_material[piece_index] = max(extents) + constants.PIECE_MARGIN_PIXEL
+
+		self.__min_incoming_extent = min((corner[3] for corner in self.__corners), default=0.0)
+
+	def find_solution(self) -> Optional[Solution]:
+		# straight stretches of the cuts can meet at nearly right angles too, the pieces closest to one are tried as corners first
+		ranked_corner_pieces = sorted(self.__corner_errors, key=lambda piece_index: self.__corner_errors[piece_index])
+		corner_tiers = [set(ranked_corner_pieces[:CORNER_PIECE_COUNT])]
+
+		if len(ranked_corner_pieces) > CORNER_PIECE_COUNT:
+			corner_tiers.append(set(ranked_corner_pieces))
+
+		Debugger.log(f"Border first assembly of {len(self.__pieces)} pieces [{len(ranked_corner_pieces)} corner candidates, {len({border[0] for border in self.__borders} - set(ranked_corner_pieces))} border pieces]")
+
+		if sum(1 for corner in self.__candidate_corners if not corner[6]) < len(SIDE_ANGLES):
+			Debugger.log("Less than 4 frame corners, frame can't be closed")
+			return None
+
+		for corner_pieces in corner_tiers:
+			self.__classify(corner_pieces)
+			Debugger.log(f"Laying the frame with corner pieces {sorted(corner_pieces)}")
+
+			# every piece with a frame edge lies on the frame, unless its frame edges were misclassified
+			for strict in (True, False):
+				self.__strict = strict
+
+				# every corner piece is fixed at the first frame corner once, the frame is laid out once in each orientation
+				for first_piece in (piece_index for piece_index in ranked_corner_pieces if piece_index in corner_pieces):
+					for first_corner in (corner for corner in self.__corners if corner[0] == first_piece and not corner[6]):
+						for side_lengths in ((A5_WIDTH_PIXEL, A5_HEIGHT_PIXEL), (A5_HEIGHT_PIXEL, A5_WIDTH_PIXEL)):
+							self.__side_lengths = [*side_lengths, *side_lengths]
+							self.__first_corner = first_corner
+							self.__start_perimeter(first_corner)
+
+					if self.__timed_out:
+						break
+
+				if self.__best_steps is not None or self.__timed_out:
+					break
+
+				Debugger.log("Found no frame with all frame edge pieces, allowing them inside")
+
+			if self.__best_steps is not None or self.__timed_out:
+				break
+
+		Debugger.log(f"Tried {self.__nodes} perimeter placements")
+
+		if self.__timed_out:
+			Debugger.log("Border first budget exceeded, frame search is incomplete")
+
+		if self.__best_steps is None:
+			Debugger.log("Found no closed frame")
+			return None
+
+		for piece in self.__pieces:
+			piece.reset()
+
+		for piece_index, edge_index, cursor in self.__best_steps:
+			self.__pieces[piece_index].place(edge_index, cursor)
+
+		# a layout missing pieces scores better than complete ones, so it is no solution at all
+		if not self.__fill_interior():
+			for piece in self.__pieces:
+				piece.reset()
+
+			return None
+
+		score = BorderAssembler.__score([piece.placed_piece.polygon for piece in self.__pieces if piece.placed_piece is not None])
+		Debugger.log(f"Found solution with score {score}\n\n")
+
+		return Solution(self.__pieces, score, not self.__timed_out)
+
+	def __find_corners(self, piece_index: int) -> List[CornerOption]:
+		edges = self.__pieces[piece_index].edges
+		orientation = self.__orientations[piece_index]
+
+		# neighbors in the direction the frame is walked, the piece inside on the right
+		following = edges.following()
+		if orientation < 0:
+			preceding = np.empty_like(following)
+			preceding[following] = np.arange(len(following))
+			following = preceding
+
+		corners: List[CornerOption] = []
+
+		frame_edges = self.__frame_edges(piece_index)
+
+		for incoming in frame_edges:
+			# skip the short edges of a rounded corner
+			outgoing = int(following[incoming])
+			bridge = 0.0
+
+			while not edges.is_frame_edge[outgoing] and outgoing != incoming and bridge + edges.lengths[outgoing] <= CORNER_BRIDGE_PIXEL:
+				bridge += float(edges.lengths[outgoing])
+				outgoing = int(following[outgoing])
+
+			if outgoing == incoming or outgoing not in frame_edges:
+				continue
+
+			incoming_start, incoming_end = self.__walked(piece_index, incoming)
+			outgoing_start, outgoing_end = self.__walked(piece_index, outgoing)
+			incoming_direction = incoming_end - incoming_start
+			outgoing_direction = outgoing_end - outgoing_start
+
+			# the frame turns right by 90 degrees
+			turn = math.degrees(math.atan2(incoming_direction[0] * outgoing_direction[1] - incoming_direction[1] * outgoing_direction[0], float(incoming_direction @ outgoing_direction)))
+			if abs(turn - 90.0) > CORNER_ANGLE_TOLERANCE_DEGREES:
+				continue
+
+			self.__corner_errors[piece_index] = min(self.__corner_errors.get(piece_index, math.inf), abs(turn - 90.0))
+
+			# frame corner is where both edge lines meet
+			incoming_length = float(edges.lengths[incoming])
+			outgoing_length = float(edges.lengths[outgoing])
+			incoming_unit = incoming_direction / incoming_length
+			outgoing_unit = outgoing_direction / outgoing_length
+			along_incoming, _ = np.linalg.solve(np.column_stack((incoming_unit, -outgoing_unit)), outgoing_start - incoming_start)
+			corner = incoming_start + along_incoming * incoming_unit
+
+			incoming_gap = max(float(along_incoming) - incoming_length, 0.0)
+			outgoing_gap = max(float((outgoing_start - corner) @ outgoing_unit), 0.0)
+
+			corners.append((piece_index, incoming, outgoing, incoming_length + incoming_gap, outgoing_gap, outgoing_gap + outgoing_length, ()))
+
+		# large pieces can lie around several frame corners, one whole side between each two of them
+		chained = corners
+		while chained:
+			chained = [
+				(piece_index, first[1], second[2], first[3], second[4], second[5], (*first[6], first[5] + second[3] - float(edges.lengths[first[2]])))
+				for first in chained for second in corners
+				if first[2] == second[1] and first[1] != second[2] and len(first[6]) + 1 < len(SIDE_ANGLES) - 1
+			]
+			corners = corners + chained
+
+		return corners
+
+	def __frame_edges(self, piece_index: int) -> List[int]:
+		# frame edges with the whole piece on their inner side
+		edges = self.__pieces[piece_index].edges
+		points = edges.points[:, 0]
+		frame_edges: List[int] = []
+
+		for edge_index in np.flatnonzero(edges.is_frame_edge).tolist():
+			start, end = edges.points[edge_index]
+			direction = (end - start) / edges.lengths[edge_index]
+			# signed distance, positive on the side of the piece
+			distances = ((points - start) @ np.array((-direction[1], direction[0]))) * self.__orientations[piece_index]
+
+			if distances.min() >= -FRAME_EDGE_OUTSIDE_PIXEL:
+				frame_edges.append(edge_index)
+
+		return frame_edges
+
+	def __walked(self, piece_index: int, edge_index: int) -> Tuple[np.ndarray, np.ndarray]:
+		# edge end points in the direction the frame is walked
+		start, end = self.__pieces[piece_index].edges.points[edge_index]
+		return (start, end) if self.__orientations[piece_index] > 0 else (end, start)
+
+	def __cursor_along(self, piece_index: int, edge_index: int, origin: np.ndarray, angle_degrees: float, offset: float) -> Cursor:
+		# cursor that puts the edge onto the line from origin in the given direction, starting at offset, with the piece on the right
+		direction = np.array((math.cos(math.radians(angle_degrees)), -math.sin(math.radians(angle_degrees))))
+
+		if self.__orientations[piece_index] > 0:
+			return Cursor(Point(*(origin + offset * direction)), angle_degrees)
+
+		return Cursor(Point(*(origin + (offset + float(self.__pieces[piece_index].edges.lengths[edge_index])) * direction)), angle_degrees + 180.0)
+
+	def __place_along(self, piece_index: int, edge_index: int, origin: np.ndarray, angle_degrees: float, offset: float):
+		self.__place(piece_index, edge_index, self.__cursor_along(piece_index, edge_index, origin, angle_degrees, offset))
+
+	def __place(self, piece_index: int, edge_index: int, cursor: Cursor):
+		self.__pieces[piece_index].place(edge_index, cursor)
+		self.__steps.append((piece_index, edge_index, cursor))
+		self.__scorer.push(self.__pieces[piece_index].placed_piece.polygon) # pyright: ignore[reportOptionalMemberAccess]
+		self.__used[piece_index] = True
+
+	def __unplace(self, piece_index: int):
+		self.__pieces[piece_index].reset()
+		self.__steps.pop()
+		self.__scorer.pop()
+		self.__used[piece_index] = False
+
+	def __start_perimeter(self, first_corner: CornerOption):
+		piece_index, _, outgoing, _, outgoing_gap, outgoing_extent, _ = first_corner
+		origin = np.zeros(2)
+		self.__start_nodes = 0
+
+		# limited discrepancy search, the best fitting neighbor is right most of the time
+		# every pass allows more deviations from it, so good frames are found before the node limit ends the search
+		for discrepancies in range(MAX_DISCREPANCIES + 1):
+			if self.__start_nodes > PERIMETER_NODE_LIMIT or self.__timed_out:
+				break
+
+			self.__visited.clear()
+			self.__place_along(piece_index, outgoing, origin, SIDE_ANGLES[0], outgoing_gap)
+			self.__extend(0, origin, outgoing_extent, piece_index, outgoing, discrepancies)
+			self.__unplace(piece_index)
+
+	def __extend(self, side: int, origin: np.ndarray, offset: float, last_piece: int, last_edge: int, discrepancies: int):
+		# offset is where the last piece on this side ends, the next one starts a piece gap further
+		# the n-th best fitting option uses up n discrepancies
+		self.__nodes += 1
+		self.__start_nodes += 1
+
+		if self.__start_nodes > PERIMETER_NODE_LIMIT or self.__timed_out:
+			return
+
+		if time.time() > self.__deadline:
+			self.__timed_out = True
+			return
+
+		# overlap only grows with more pieces, it is only measured once a closed frame bounds it
+		if self.__best_cost < math.inf and self.__scorer.overlap_area >= self.__best_cost:
+			return
+
+		state = (side, tuple(self.__used), last_piece, last_edge, round(offset), *np.round(origin).astype(int).tolist())
+		if state in self.__visited:
+			return
+
+		self.__visited.add(state)
+
+		side_length = self.__side_lengths[side]
+		min_length = side_length * (1 - SIDE_LENGTH_TOLERANCE)
+		max_length = side_length * (1 + SIDE_LENGTH_TOLERANCE)
+		next_offset = offset + constants.PIECE_MARGIN_PIXEL
+
+		# remaining pieces must still be able to cover the rest of the frame, in strict mode without any left over
+		# the first corner closes the frame and still covers its incoming side
+		later_sides = sum(self.__side_lengths[side + 1:])
+		unused = [piece_index for piece_index, used in enumerate(self.__used) if not used]
+		first_incoming = constants.PIECE_MARGIN_PIXEL + self.__first_corner[3]
+
+		if sum(self.__max_material[piece_index] for piece_index in unused) + first_incoming < min_length - offset + later_sides * (1 - SIDE_LENGTH_TOLERANCE):
+			return
+
+		if self.__strict and sum(self.__min_material[piece_index] for piece_index in unused) + first_incoming > max_length - offset + later_sides * (1 + SIDE_LENGTH_TOLERANCE):
+			return
+
+		# (fit to the last placed piece, border option, corner option)
+		options: List[Tuple[float, Optional[BorderOption], Optional[CornerOption]]] = []
+
+		for corner in self.__corners:
+			piece_index, incoming = corner[0], corner[1]
+
+			if side == len(SIDE_ANGLES) - 1:
+				# the first corner closes the frame
+				if corner is self.__first_corner and min_length <= next_offset + corner[3] <= max_length:
+					if not (self.__strict and any(self.__max_material[unused_index] > 0 for unused_index in unused)):
+						self.__close_frame()
+			elif not self.__used[piece_index] and min_length <= next_offset + corner[3] <= max_length and self.__fits_sides(side, corner) and self.__compatibility.score(last_piece, last_edge, piece_index, incoming) > 0:
+				options.append((self.__fit(last_piece, last_edge, None, corner), None, corner))
+
+		for border in self.__borders:
+			piece_index, edge_index, extent = border
+
+			# a corner piece only lies along a single side once corners may have been misclassified, and a corner still has to close the side
+			if not self.__used[piece_index] and not (self.__strict and piece_index in self.__corner_pieces) and next_offset + extent + constants.PIECE_MARGIN_PIXEL + self.__min_incoming_extent <= max_length and self.__compatibility.score(last_piece, last_edge, piece_index, edge_index) > 0:
+				options.append((self.__fit(last_piece, last_edge, border, None), border, None))
+
+		options.sort(key=lambda option: option[0])
+
+		for rank, (_, border, corner) in enumerate(options[:discrepancies + 1]):
+			if border is not None:
+				piece_index, edge_index, extent = border
+				self.__place_along(piece_index, edge_index, origin, SIDE_ANGLES[side], next_offset)
+				self.__extend(side, origin, next_offset + extent, piece_index, edge_index, discrepancies - rank)
+				self.__unplace(piece_index)
+			else:
+				piece_index, _, outgoing, _, _, outgoing_extent, middle_lengths = corner # pyright: ignore[reportGeneralTypeIssues]
+				next_origin = self.__place_corner(side, origin, offset, corner) # pyright: ignore[reportArgumentType]
+				self.__extend(side + len(middle_lengths) + 1, next_origin, outgoing_extent, piece_index, outgoing, discrepancies - rank)
+				self.__unplace(piece_index)
+
+	def __fit(self, last_piece: int, last_edge: int, border: Optional[BorderOption], corner: Optional[CornerOption]) -> float:
+		# neighbors whose cuts interlock keep the piece gap along the whole cut, they neither come closer nor leave wider gaps
+		# the fit only depends on both pieces, it is measured once with the last piece at the start of the first side
+		key = (last_piece, last_edge, border, corner)
+		fit = self.__fits.get(key)
+
+		if fit is None:
+			zones = self.__neighbor_zones.get((last_piece, last_edge))
+
+			if zones is None:
+				polygon = self.__laid(last_piece, last_edge, self.__cursor_along(last_piece, last_edge, np.zeros(2), SIDE_ANGLES[0], 0.0))
+				zones = (polygon.buffer(constants.PIECE_MARGIN_PIXEL * NEIGHBOR_NEAR_GAP), polygon.buffer(constants.PIECE_MARGIN_PIXEL * NEIGHBOR_FAR_GAP))
+				self.__neighbor_zones[(last_piece, last_edge)] = zones
+
+			offset = float(self.__pieces[last_piece].edges.lengths[last_edge])
+
+			if border is not None:
+				polygon = self.__laid(border[0], border[1], self.__cursor_along(border[0], border[1], np.zeros(2), SIDE_ANGLES[0], offset + constants.PIECE_MARGIN_PIXEL))
+			else:
+				_, cursor = self.__corner_cursor(0, np.zeros(2), offset, corner) # pyright: ignore[reportArgumentType]
+				polygon = self.__laid(corner[0], corner[2], cursor) # pyright: ignore[reportOptionalSubscript]
+
+			near_area, far_area = shapely.area(shapely.intersection(polygon, zones))
+			fit = NEIGHBOR_NEAR_WEIGHT * float(near_area) - float(far_area)
+			self.__fits[key] = fit
+
+		return fit
+
+	def __laid(self, piece_index: int, edge_index: int, cursor: Cursor) -> Polygon:
+		# piece polygon as placed at the cursor, without placing the piece
+		matrix = self.__pieces[piece_index].placement_matrix(edge_index, cursor)
+		return shapely.transform(self.__pieces[piece_index].polygon, lambda coords: EdgeTable.transform_points(coords, matrix))
+
+	def __fits_sides(self, side: int, corner: CornerOption) -> bool:
+		# the first corner closes the frame, and the whole sides a piece lies along have to match their length
+		middle_lengths = corner[6]
+
+		if side + len(middle_lengths) + 1 >= len(SIDE_ANGLES):
+			return False
+
+		return all(abs(length - self.__side_lengths[side + 1 + index]) <= self.__side_lengths[side + 1 + index] * SIDE_LENGTH_TOLERANCE for index, length in enumerate(middle_lengths))
+
+	def __place_corner(self, side: int, origin: np.ndarray, offset: float, corner: CornerOption) -> np.ndarray:
+		# places the corner piece at the end of the side, returns the frame corner the next side starts at
+		next_origin, cursor = self.__corner_cursor(side, origin, offset, corner)
+		self.__place(corner[0], corner[2], cursor)
+
+		return next_origin
+
+	def __corner_cursor(self, side: int, origin: np.ndarray, offset: float, corner: CornerOption) -> Tuple[np.ndarray, Cursor]:
+		# frame corner after the last whole side the piece lies along, and the cursor laying its outgoing edge from there
+		piece_index, _, outgoing, incoming_extent, outgoing_gap, _, middle_lengths = corner
+		next_origin = origin + (offset + constants.PIECE_MARGIN_PIXEL + incoming_extent) * BorderAssembler.__direction(side)
+
+		for index, length in enumerate(middle_lengths):
+			next_origin = next_origin + length * BorderAssembler.__direction(side + 1 + index)
+
+		return next_origin, self.__cursor_along(piece_index, outgoing, next_origin, SIDE_ANGLES[side + len(middle_lengths) + 1], outgoing_gap)
+
+	@staticmethod
+	def __direction(side: int) -> np.ndarray:
+		angle = math.radians(SIDE_ANGLES[side])
+		return np.array((math.cos(angle), -math.sin(angle)))
+
+	def __close_frame(self):
+		# same score as __score, the scorer keeps overlap and bounds of the laid frame up to date
+		min_x, min_y, max_x, max_y = self.__scorer.bounds
+		cost = self.__scorer.overlap_area + abs((max_x - min_x) * (max_y - min_y) - constants.A5_AREA_PIXEL)
+
+		# the frame has to leave room for the pieces inside, the hole is only cut out for frames that can still win
+		interior_area = sum(piece.polygon.area for piece in self.__pieces if piece.placed_piece is None)
+		if interior_area > 0 and cost < self.__best_cost:
+			cost += max(interior_area - BorderAssembler.__hole([piece.placed_piece.polygon for piece in self.__pieces if piece.placed_piece is not None]).area, 0.0)
+
+		if cost < self.__best_cost:
+			self.__best_cost = cost
+			self.__best_steps = list(self.__steps)
+
+	def __fill_interior(self) -> bool:
+		# hole inside the frame, kept a piece gap away from placed pieces
+		hole = BorderAssembler.__hole([piece.placed_piece.polygon for piece in self.__pieces if piece.placed_piece is not None])
+
+		remaining = sorted((piece_index for piece_index, piece in enumerate(self.__pieces) if piece.placed_piece is None), key=lambda piece_index: -self.__pieces[piece_index].polygon.area)
+
+		for piece_index in remaining:
+			# simplified like the piece outlines, exact overlays of many poses against the hole are the costly part
+			hole = hole.simplify(EDGE_SIMPLIFY_TOLERANCE)
+			best = self.__best_interior_step(piece_index, hole)
+
+			if best is None:
+				Debugger.log(f"No room left for piece {piece_index}")
+				return False
+
+			edge_index, cursor = best
+			self.__pieces[piece_index].place(edge_index, cursor)
+			hole = hole.difference(self.__pieces[piece_index].placed_piece.polygon.buffer(constants.PIECE_MARGIN_PIXEL)) # pyright: ignore[reportOptionalMemberAccess]
+
+		return True
+
+	def __best_interior_step(self, piece_index: int, hole) -> Optional[Tuple[int, Cursor]]:
+		# lays every piece edge onto every hole edge, flush with either hole edge end, and keeps the pose least outside the hole
+		piece = self.__pieces[piece_index]
+		# (edge index, hole edge start x, hole edge start y, hole edge angle, offset along the hole edge)
+		candidates: List[Tuple[int, float, float, float, float]] = []
+
+		for region in shapely.get_parts(hole):
+			if region.area <= 0:
+				continue
+
+			ring = shapely.get_coordinates(orient(cast(Polygon, region), 1.0).exterior)
+
+			for start, end in zip(ring[:-1], ring[1:]):
+				hole_edge_length = float(np.hypot(*(end - start)))
+
+				if hole_edge_length < SHORT_EDGE_LENGTH:
+					continue
+
+				angle = math.degrees(math.atan2(-(end[1] - start[1]), end[0] - start[0]))
+
+				for edge_index in np.flatnonzero(piece.edges.tiers <= EDGE_TIER_INTERSECTING).tolist():
+					length = float(piece.edges.lengths[edge_index])
+
+					for offset in {0.0, hole_edge_length - length}:
+						candidates.append((edge_index, float(start[0]), float(start[1]), angle, offset))
+
+		if not candidates:
+			return None
+
+		# cursors of every pose like __cursor_along, only the chosen one is built as a Cursor
+		edge_indices, start_x, start_y, angles, offsets = (np.array(column) for column in zip(*candidates))
+		edge_indices = edge_indices.astype(np.intp)
+		directions = np.radians(angles)
+		if self.__orientations[piece_index] < 0:
+			offsets = offsets + piece.edges.lengths[edge_indices]
+			angles = angles + 180.0
+		points = np.column_stack((start_x + offsets * np.cos(directions), start_y - offsets * np.sin(directions)))
+
+		# a pose fits when the piece stays inside the hole and leaves no room around it, like a piece pressed into a corner
+		# poses are ranked on sample points first, only the best ones are measured exactly
+		grown = piece.polygon.buffer(constants.PIECE_MARGIN_PIXEL)
+		shapely.prepare(hole)
+
+		matrices = piece.placement_matrices(edge_indices, points, angles)
+		ranked = np.arange(len(candidates))
+
+		for sample_pixel, poses in ((INTERIOR_COARSE_SAMPLE_PIXEL, INTERIOR_COARSE_POSES), (INTERIOR_SAMPLE_PIXEL, INTERIOR_EXACT_POSES)):
+			estimates = BorderAssembler.__outside_estimates(piece.polygon, grown, matrices[ranked], hole, sample_pixel)
+			ranked = ranked[np.argsort(estimates, kind="stable")[:poses]]
+
+		best = ranked
+		polygons = [shapely.transform(piece.polygon, lambda coords, matrix=matrices[index]: EdgeTable.transform_points(coords, matrix)) for index in best]
+		surroundings = [shapely.transform(grown, lambda coords, matrix=matrices[index]: EdgeTable.transform_points(coords, matrix)) for index in best]
+		covered = shapely.area(shapely.intersection(polygons, hole))
+		cost = (piece.polygon.area - covered) + (shapely.area(shapely.intersection(surroundings, hole)) - covered)
+
+		edge_index, start_x, start_y, angle, offset = candidates[int(best[np.argmin(cost)])]
+
+		return edge_index, self.__cursor_along(piece_index, edge_index, np.array((start_x, start_y)), angle, offset)
+
+	@staticmethod
+	def __outside_estimates(polygon: Polygon, grown: Polygon, matrices: np.ndarray, hole, sample_pixel: float) -> np.ndarray:
+		# samples of every pose outside the hole, plus samples of the room around it still inside
+		piece_samples = RasterScorer.sample(polygon, sample_pixel)
+		room_samples = RasterScorer.sample(grown.difference(polygon), sample_pixel)
+		rotations = matrices[:, :, :2].transpose(0, 2, 1)
+		piece_points = piece_samples @ rotations + matrices[:, None, :, 2]
+		room_points = room_samples @ rotations + matrices[:, None, :, 2]
+
+		return (~shapely.contains_xy(hole, piece_points[..., 0], piece_points[..., 1])).sum(axis=1) + shapely.contains_xy(hole, room_points[..., 0], room_points[..., 1]).sum(axis=1)
+
+	@staticmethod
+	def __hole(polygons: List[Polygon]) -> Polygon:
+		# room inside the frame, kept a piece gap away from placed pieces
+		return box(*shapely.union_all(polygons).bounds).difference(shapely.union_all(shapely.buffer(polygons, constants.PIECE_MARGIN_PIXEL)))
+
+	@staticmethod
+	def __score(polygons: List[Polygon]) -> float:
+		# same score as the matcher, overlap plus bounding area difference to A5
+		union = shapely.union_all(polygons)
+		min_x, min_y, max_x, max_y = union.bounds
+		overlap_area = sum(polygon.area for polygon in polygons) - union.area
+
+		return overlap_area + abs((max_x - min_x) * (max_y - min_y) - constants.A5_AREA_PIXEL)
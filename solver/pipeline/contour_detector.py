@@ -1,95 +1,398 @@
-from typing import List, Sequence, cast
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple, cast
 
 import cv2
 from cv2.typing import MatLike
 import numpy as np
-from shapely import Polygon
+from shapely import Polygon, affinity
 from solver.debugger import Debugger
 from solver.constants import *
+from solver.pipeline.threshold_cache import ThresholdCache
 
 
 ROUGHENING_TOLERANCE = 1.5
+THRESHOLDS = range(20, 200, 5)
+MORPHOLOGY_KERNEL = np.ones((3, 3), np.uint8)
+# close + open with the kernel change pixels at most this far from where they look
+MORPHOLOGY_REACH_PIXEL = 2
+
+# threshold selection strategies
+STRATEGY_EXHAUSTIVE = "exhaustive"
+STRATEGY_HISTOGRAM = "histogram"
+STRATEGIES = [STRATEGY_EXHAUSTIVE, STRATEGY_HISTOGRAM]
+
+HISTOGRAM_SMOOTHING = 15
+HISTOGRAM_CANDIDATE_SPREAD = 8
+HISTOGRAM_REFINE_RADIUS = 4
+
+# multi-scale detection
+PYRAMID_ROI_MARGIN_PIXEL = 8
+PYRAMID_TOLERANCE = 0.05
+
+# cached thresholds are accepted below this score, else the full sweep runs
+# valid segmentations of the test captures score 0.69-0.95, merged or lost pieces 1.49 and above
+WARM_START_SCORE_CUTOFF = 1.0
+# and at most this much worse than the full sweep that cached them
+WARM_START_SCORE_MARGIN = 0.25
 
 class ContourDetector:
+	__threshold_cache: Optional[ThresholdCache] = None
+
 	@staticmethod
-	def detect(image) -> List[Polygon]:
+	def detect(image, strategy: str = STRATEGY_EXHAUSTIVE, workers: int = 1, pyramid_levels: int = 0, warm_start: bool = False, cropped: bool = False, piece_counts: Sequence[int] = PIECE_COUNTS) -> List[Polygon]:
 		Debugger.log("Detecting contours\n")
 
-		# crop image to A4 area
-		cropped_image = image[
-			A4_OFFSET_TOP_PIXEL : int(A4_OFFSET_TOP_PIXEL + A4_HEIGHT_MICROMETER / PIXEL_TO_MICROMETER_FACTOR),
-			A4_OFFSET_LEFT_PIXEL : int(A4_OFFSET_LEFT_PIXEL + A4_WIDTH_MICROMETER / PIXEL_TO_MICROMETER_FACTOR)
-		]
+		# threads only pay off with a core for each, on a single core the pool is pure overhead
+		cpu_count = os.cpu_count() or 1
+
+		if workers > cpu_count:
+			Debugger.log(f"Limiting threshold workers from {workers} to {cpu_count} (cpu count)")
+			workers = cpu_count
 
-		# ignore color
-		grayscale_image = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY)
+		# crop image to A4 area (roi captures already are)
+		cropped_image = image if cropped else ContourDetector.crop(image)
+
+		# ignore color (luminance captures already are grayscale)
+		grayscale_image = cropped_image if cropped_image.ndim == 2 else cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY)
 
 		# low-pass filter to attenuate high-frequency (noise, fine textures) while preserving low-frequency (object boundaries)
 		gaussian_image = cv2.GaussianBlur(grayscale_image, (5, 5), 0)
 
+		if pyramid_levels > 0:
+			best_score, best_result = ContourDetector.__select_pyramid(gaussian_image, strategy, workers, pyramid_levels, warm_start, piece_counts)
+		else:
+			best_score, best_result, _ = ContourDetector.__select(gaussian_image, strategy, workers, 1, warm_start, piece_counts)
+
+		Debugger.log(f"Best score is {best_score}\n\n")
+
+		return best_result
+
+	@staticmethod
+	def crop(image: MatLike) -> MatLike:
+		left, top, width, height = A4_ROI_PIXEL
+		return image[top : top + height, left : left + width]
+
+	@staticmethod
+	def __select(gaussian_image: MatLike, strategy: str, workers: int, scale: int, warm_start: bool, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]], Optional[int]]:
+		if strategy not in STRATEGIES:
+			raise ValueError(f"strategy must be one of {STRATEGIES!r}, got {strategy!r}")
+
+		# morphology is shared by every threshold of the sweep
+		sweep_image = ContourDetector.__prepare_sweep(gaussian_image)
+
+		if not warm_start:
+			return ContourDetector.__select_strategy(gaussian_image, sweep_image, strategy, workers, scale, piece_counts)
+
+		if ContourDetector.__threshold_cache is None:
+			ContourDetector.__threshold_cache = ThresholdCache()
+
+		# try the thresholds that won under similar lighting at the same scale and piece counts first
+		context = ThresholdCache.context(scale, piece_counts)
+		signature = ThresholdCache.signature(gaussian_image)
+		cached_thresholds, cached_score = ContourDetector.__threshold_cache.lookup(context, signature)
+
+		if len(cached_thresholds) > 0:
+			best_score, best_result, best_threshold = ContourDetector.__sweep(sweep_image, cached_thresholds, workers, scale, piece_counts)
+			cutoff = WARM_START_SCORE_CUTOFF if cached_score is None else min(WARM_START_SCORE_CUTOFF, cached_score * (1 + WARM_START_SCORE_MARGIN))
+
+			if best_score < cutoff:
+				Debugger.log(f"Accepted cached threshold {best_threshold} with score {best_score:.3f}")
+				ContourDetector.__threshold_cache.store(context, signature, best_threshold)
+				return best_score, best_result, best_threshold
+
+			Debugger.log(f"Cached thresholds scored {best_score:.3f} (cutoff {cutoff:.3f}), running full sweep")
+
+		best_score, best_result, best_threshold = ContourDetector.__select_strategy(gaussian_image, sweep_image, strategy, workers, scale, piece_counts)
+
+		if best_threshold is not None:
+			ContourDetector.__threshold_cache.store(context, signature, best_threshold, best_score)
+
+		return best_score, best_result, best_threshold
+
+	@staticmethod
+	def __select_strategy(gaussian_image: MatLike, sweep_image: MatLike, strategy: str, workers: int, scale: int, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]], Optional[int]]:
 		# extract contours with different thresholds and choose best result
 		# best result is where contour areas add up closest to target frame area
-		# only allow results with 4 OR 6 contours
+		# only allow results with one of the expected piece counts
+		if strategy == STRATEGY_HISTOGRAM:
+			return ContourDetector.__sweep_histogram(gaussian_image, sweep_image, workers, scale, piece_counts)
+
+		return ContourDetector.__sweep(sweep_image, THRESHOLDS, workers, scale, piece_counts)
+
+	@staticmethod
+	def __select_pyramid(gaussian_image: MatLike, strategy: str, workers: int, levels: int, warm_start: bool, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]]]:
+		# every level halves the resolution, pixel constants are scaled accordingly
+		scale = 2 ** levels
+		coarse_image = gaussian_image
+
+		for _ in range(levels):
+			coarse_image = cv2.pyrDown(coarse_image)
+
+		Debugger.log(f"Sweeping at {coarse_image.shape[1]}x{coarse_image.shape[0]} (1/{scale} resolution)")
+		_, coarse_result, threshold = ContourDetector.__select(coarse_image, strategy, workers, scale, warm_start, piece_counts)
+
+		if coarse_result is None or threshold is None:
+			Debugger.log("Pyramid sweep found no valid result, sweeping at full resolution")
+			best_score, best_result, _ = ContourDetector.__select(gaussian_image, strategy, workers, 1, False, piece_counts)
+			return best_score, best_result
+
+		# a refined piece that stays clear of its region border is the full resolution piece at the same threshold
+		# pieces merged or cut at the coarse level differ from their refinement, the full resolution sweep handles those
+		refined_result = ContourDetector.__refine(gaussian_image, coarse_result, threshold, scale)
+		deviation = ContourDetector.__deviation(refined_result, [affinity.scale(polygon, scale, scale, origin=(0, 0)) for polygon in coarse_result])
+
+		if refined_result is None:
+			Debugger.log(f"Pyramid refinement at threshold {threshold} lost or clipped a piece, sweeping at full resolution")
+		elif deviation > PYRAMID_TOLERANCE:
+			Debugger.log(f"Pyramid refinement at threshold {threshold} deviates {deviation * 100:.2f}% from the coarse pieces (tolerance {PYRAMID_TOLERANCE * 100:.2f}%), sweeping at full resolution")
+
+		if refined_result is None or deviation > PYRAMID_TOLERANCE:
+			best_score, best_result, _ = ContourDetector.__select(gaussian_image, strategy, workers, 1, False, piece_counts)
+			return best_score, best_result
+
+		Debugger.log(f"Pyramid refinement at threshold {threshold} deviates {deviation * 100:.2f}% from the coarse pieces (tolerance {PYRAMID_TOLERANCE * 100:.2f}%)")
+
+		return ContourDetector.__rate_solution(refined_result, A5_AREA_PIXEL, 1, piece_counts), refined_result
+
+	@staticmethod
+	def __refine(gaussian_image: MatLike, coarse_polygons: List[Polygon], threshold: int, scale: int) -> Optional[List[Polygon]]:
+		height, width = gaussian_image.shape[:2]
+		margin = PYRAMID_ROI_MARGIN_PIXEL * scale
+
+		polygons: List[Polygon] = []
+
+		# re-extract every piece at full resolution inside its scaled bounding box
+		for coarse_polygon in coarse_polygons:
+			min_x, min_y, max_x, max_y = coarse_polygon.bounds
+			left = max(0, int(min_x * scale) - margin)
+			top = max(0, int(min_y * scale) - margin)
+			right = min(width, int(max_x * scale) + margin)
+			bottom = min(height, int(max_y * scale) + margin)
+
+			sweep_image = ContourDetector.__prepare_sweep(gaussian_image[top:bottom, left:right])
+			_, threshold_image = cv2.threshold(sweep_image, threshold, 255, cv2.THRESH_BINARY_INV)
+
+			contours, _ = cv2.findContours(threshold_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(left, top))
+			contours, _ = ContourDetector.__prefilter(contours, 1)
+			candidates = ContourDetector.__to_polygons([Polygon(contour.squeeze()) for contour in contours], 1)
+
+			if len(candidates) == 0:
+				return None
+
+			# neighbouring pieces may reach into the ROI, the piece itself is the largest contour
+			polygon = max(candidates, key=lambda candidate: candidate.area)
+
+			# morphology inside the ROI only matches the full image away from ROI borders that aren't image borders
+			piece_left, piece_top, piece_right, piece_bottom = polygon.bounds
+			if (left > 0 and piece_left - left < MORPHOLOGY_REACH_PIXEL) or (top > 0 and piece_top - top < MORPHOLOGY_REACH_PIXEL) or (right < width and right - 1 - piece_right < MORPHOLOGY_REACH_PIXEL) or (bottom < height and bottom - 1 - piece_bottom < MORPHOLOGY_REACH_PIXEL):
+				return None
+
+			polygons.append(polygon)
+
+		return polygons
+
+	@staticmethod
+	def __deviation(polygons: Optional[List[Polygon]], references: Optional[List[Polygon]]) -> float:
+		# largest area share by which a piece differs from the reference piece it overlaps most
+		if polygons is None or references is None or len(polygons) != len(references):
+			return float("inf")
+
+		deviation = 0.0
+
+		for polygon in polygons:
+			reference = max(references, key=lambda candidate: candidate.intersection(polygon).area)
+			deviation = max(deviation, polygon.symmetric_difference(reference).area / reference.area)
+
+		return deviation
+
+	@staticmethod
+	def __sweep(sweep_image: MatLike, thresholds: Sequence[int], workers: int, scale: int, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]], Optional[int]]:
 		best_score = float("inf")
-		best_result: List[Polygon] = None
+		best_result: Optional[List[Polygon]] = None
+		best_threshold: Optional[int] = None
 
-		for threshold in range(20, 200, 5):
-			_, threshold_image = cv2.threshold(gaussian_image, threshold, 255, cv2.THRESH_BINARY_INV)
-			kernel = np.ones((3,3), np.uint8)
-			threshold_image = cv2.morphologyEx(threshold_image, cv2.MORPH_OPEN, kernel)
-			threshold_image = cv2.morphologyEx(threshold_image, cv2.MORPH_CLOSE, kernel)
+		evaluate = lambda threshold: ContourDetector.__evaluate(sweep_image, threshold, scale, piece_counts)
 
-			# external to filter out holes in pieces
-			contours, _ = cv2.findContours(threshold_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-			polygons = ContourDetector.__to_polygons(contours)
+		# thresholds are independent and cv2 releases the GIL
+		# results are reduced in threshold order so the outcome equals the serial sweep
+		if workers > 1:
+			with ThreadPoolExecutor(max_workers=workers) as executor:
+				results = list(executor.map(evaluate, thresholds))
+		else:
+			results = map(evaluate, thresholds)
 
-			score = ContourDetector.__rate_solution(polygons, A5_AREA_PIXEL)
+		for threshold, (score, polygons, delta_time) in zip(thresholds, results):
+			if polygons is None:
+				Debugger.log(f"[THRESHOLD={threshold}]\t[SCORE={score:.3f}]\t[TIME={delta_time * 1000:.1f}ms]\tRejected before polygon construction")
+				continue
 
 			if score < best_score:
 				best_score = score
 				best_result = polygons
+				best_threshold = threshold
 
-			Debugger.log(f"[THRESHOLD={threshold}]\t[SCORE={score:.3f}]\tFound {len(polygons)} pieces with {[len(polygon.exterior.coords) for polygon in polygons]} points")
+			Debugger.log(f"[THRESHOLD={threshold}]\t[SCORE={score:.3f}]\t[TIME={delta_time * 1000:.1f}ms]\tFound {len(polygons)} pieces with {[len(polygon.exterior.coords) for polygon in polygons]} points")
 
-		Debugger.log(f"Best score is {best_score}\n\n")
+		return best_score, best_result, best_threshold
 
-		return best_result
+	@staticmethod
+	def __evaluate(sweep_image: MatLike, threshold: int, scale: int, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]], float]:
+		start_time = time.perf_counter()
+
+		_, threshold_image = cv2.threshold(sweep_image, threshold, 255, cv2.THRESH_BINARY_INV)
+
+		# external to filter out holes in pieces
+		contours, _ = cv2.findContours(threshold_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+		# staged rejection, shapely work only starts once a valid piece count is still reachable
+		# stage 1: drop contours that can't reach the minimum area (cv2 only)
+		contours, keeps_area = ContourDetector.__prefilter(contours, scale)
+
+		if len(contours) < min(piece_counts):
+			return float("inf"), None, time.perf_counter() - start_time
+
+		outlines = [Polygon(contour.squeeze()) for contour in contours]
+
+		# stage 2: large valid outlines survive the topology preserving simplification for sure
+		# validity is costly so it is only checked when the area alone suggests a rejection
+		if not ContourDetector.__is_count_reachable(sum(keeps_area), len(outlines), piece_counts):
+			certain_count = sum(1 for outline, keeps in zip(outlines, keeps_area) if keeps and outline.is_valid)
+
+			if not ContourDetector.__is_count_reachable(certain_count, len(outlines), piece_counts):
+				return float("inf"), None, time.perf_counter() - start_time
+
+		# stage 3: simplify and rate the remaining thresholds
+		polygons = ContourDetector.__to_polygons(outlines, scale)
+
+		score = ContourDetector.__rate_solution(polygons, A5_AREA_PIXEL / scale ** 2, scale, piece_counts)
+
+		return score, polygons, time.perf_counter() - start_time
 
 	@staticmethod
-	def __to_polygons(contours: Sequence[MatLike]) -> List[Polygon]:
-		polygons: List[Polygon] = []
+	def __sweep_histogram(gaussian_image: MatLike, sweep_image: MatLike, workers: int, scale: int, piece_counts: Sequence[int]) -> Tuple[float, Optional[List[Polygon]], Optional[int]]:
+		candidates = ContourDetector.__histogram_candidates(gaussian_image)
+		Debugger.log(f"Histogram candidates {candidates}")
+
+		best_score, best_result, best_threshold = ContourDetector.__sweep(sweep_image, candidates, workers, scale, piece_counts)
+
+		# histogram did not separate pieces from background
+		if best_threshold is None:
+			Debugger.log("No histogram candidate is valid, falling back to exhaustive sweep")
+			return ContourDetector.__sweep(sweep_image, THRESHOLDS, workers, scale, piece_counts)
+
+		# refine around best candidate at full grey level resolution
+		refinement = [
+			threshold
+			for threshold in range(best_threshold - HISTOGRAM_REFINE_RADIUS, best_threshold + HISTOGRAM_REFINE_RADIUS + 1)
+			if THRESHOLDS.start <= threshold < THRESHOLDS.stop and threshold not in candidates
+		]
+		refined_score, refined_result, refined_threshold = ContourDetector.__sweep(sweep_image, refinement, workers, scale, piece_counts)
+
+		if refined_score < best_score:
+			return refined_score, refined_result, refined_threshold
+
+		return best_score, best_result, best_threshold
+
+	@staticmethod
+	def __histogram_candidates(gaussian_image: MatLike) -> List[int]:
+		histogram = cv2.calcHist([gaussian_image], [0], None, [256], [0, 256]).ravel()
+		smoothed = np.convolve(histogram, np.ones(HISTOGRAM_SMOOTHING) / HISTOGRAM_SMOOTHING, mode="same")
+
+		# modes and valleys are the local extrema of the smoothed histogram
+		extrema: List[int] = []
+
+		for level in range(1, len(smoothed) - 1):
+			is_valley = smoothed[level - 1] > smoothed[level] <= smoothed[level + 1]
+			is_mode = smoothed[level - 1] < smoothed[level] >= smoothed[level + 1]
+
+			# merge plateaus and small ripples into one extremum
+			if (is_valley or is_mode) and (len(extrema) == 0 or level - extrema[-1] > HISTOGRAM_CANDIDATE_SPREAD):
+				extrema.append(level)
+
+		candidates = set()
+
+		for level in extrema:
+			for threshold in (level - HISTOGRAM_CANDIDATE_SPREAD, level, level + HISTOGRAM_CANDIDATE_SPREAD):
+				if THRESHOLDS.start <= threshold < THRESHOLDS.stop:
+					candidates.add(threshold)
+
+		return sorted(candidates)
+
+	@staticmethod
+	def __prepare_sweep(gaussian_image: MatLike) -> MatLike:
+		# flat morphology commutes with thresholding:
+		# eroding the inverted threshold mask equals thresholding the dilated grayscale image (and vice versa)
+		# so open + close on every mask equals one grayscale close + open followed by the plain threshold
+		closed_image = cv2.morphologyEx(gaussian_image, cv2.MORPH_CLOSE, MORPHOLOGY_KERNEL)
+		return cv2.morphologyEx(closed_image, cv2.MORPH_OPEN, MORPHOLOGY_KERNEL)
+
+	@staticmethod
+	def __prefilter(contours: Sequence[MatLike], scale: int) -> Tuple[List[MatLike], List[bool]]:
+		min_area = PIECE_MIN_AREA_PIXEL / scale ** 2
+
+		candidates: List[MatLike] = []
+		keeps_area: List[bool] = []
 
 		for contour in contours:
 			# ignore invalid contours
-			if len(contour) >= 3:
-				points = contour.squeeze()
+			if len(contour) < 3:
+				continue
+
+			area = cv2.contourArea(contour)
+			slack = ContourDetector.__simplify_slack(contour, scale)
+
+			# can't reach the minimum area even after simplification
+			if area + slack < min_area:
+				continue
 
-				polygon = Polygon(points)
-				# roughen shape for better performance
-				polygon = cast(Polygon, polygon.simplify(ROUGHENING_TOLERANCE, preserve_topology=True))
+			candidates.append(contour)
+			keeps_area.append(area - slack >= min_area)
 
-				if polygon.is_valid and polygon.area >= PIECE_MIN_AREA_PIXEL:
-					polygons.append(polygon)
+		return candidates, keeps_area
+
+	@staticmethod
+	def __is_count_reachable(min_count: int, max_count: int, piece_counts: Sequence[int]) -> bool:
+		return any(min_count <= count <= max_count for count in piece_counts)
+
+	@staticmethod
+	def __simplify_slack(contour: MatLike, scale: int) -> float:
+		# simplification replaces point runs by chords they stay within the tolerance of
+		# so the area changes at most by the tolerance band around every chord
+		tolerance = ROUGHENING_TOLERANCE / scale
+		return 2 * tolerance * cv2.arcLength(contour, True) + len(contour) * math.pi * tolerance ** 2
+
+	@staticmethod
+	def __to_polygons(outlines: Sequence[Polygon], scale: int) -> List[Polygon]:
+		polygons: List[Polygon] = []
+
+		for outline in outlines:
+			# roughen shape for better performance
+			polygon = cast(Polygon, outline.simplify(ROUGHENING_TOLERANCE / scale, preserve_topology=True))
+
+			if polygon.is_valid and polygon.area >= PIECE_MIN_AREA_PIXEL / scale ** 2:
+				polygons.append(polygon)
 
 		return polygons
 
 	@staticmethod
-	def __rate_solution(polygons: List[Polygon], target_area: float) -> float:
-		if len(polygons) == 0:
+	def __rate_solution(polygons: List[Polygon], target_area: float, scale: int, piece_counts: Sequence[int]) -> float:
+		# invalid puzzle piece count
+		if len(polygons) == 0 or len(polygons) not in piece_counts:
 			return float("inf")
 
 		# validate area similarity
 		total_area = sum(polygon.area for polygon in polygons)
 		area_error = abs(total_area - target_area) / target_area
 
-		# invalid puzzle piece count
-		if len(polygons) not in PIECE_COUNTS:
-			return float("inf")
-
 		# validate contour noise
 		vertex_penalty = sum(len(polygon.exterior.coords) for polygon in polygons) / len(polygons)
-		compactness_penalty = sum((polygon.length / polygon.area) for polygon in polygons if polygon.area > 0) / len(polygons)
-		convexity_penalty = sum(((p.convex_hull.area - p.area) / p.convex_hull.area) for p in polygons if p.convex_hull.area > 0) / len(polygons)
+		# perimeter per area grows with the downscale factor
+		compactness_penalty = sum((polygon.length / polygon.area) for polygon in polygons if polygon.area > 0) / len(polygons) / scale
+		hull_areas = [polygon.convex_hull.area for polygon in polygons]
+		convexity_penalty = sum(((hull_area - p.area) / hull_area) for p, hull_area in zip(polygons, hull_areas) if hull_area > 0) / len(polygons)
 
 		return (
 			area_error
@@ -1,4 +1,5 @@
 from typing import Optional
+import numpy as np
 
 from shapely.affinity import translate, scale
 from solver.constants import *
@@ -6,6 +7,16 @@ from solver.models.solution import Solution
 
 
 class CoordinateSystem:
+	# same corrections as 2x3 affine matrices for the edge tables
+	__A4_MATRIX = np.array((
+		(PIXEL_TO_MICROMETER_FACTOR, 0.0, A4_OFFSET_LEFT_MICROMETER),
+		(0.0, PIXEL_TO_MICROMETER_FACTOR, A4_OFFSET_TOP_MICROMETER),
+	))
+	__A5_MATRIX = np.array((
+		(PIXEL_TO_MICROMETER_FACTOR, 0.0, A5_OFFSET_LEFT_MICROMETER),
+		(0.0, PIXEL_TO_MICROMETER_FACTOR, A5_OFFSET_TOP_MICROMETER + A5_HEIGHT_MICROMETER),
+	))
+
 	@staticmethod
 	def correct(solution: Optional[Solution]):
 		if solution is None:
@@ -13,15 +24,11 @@ class CoordinateSystem:
 
 		for piece in solution.pieces:
 			piece.polygon = CoordinateSystem.__correct_A4(piece.polygon)
-
-			for edge in piece.edges:
-				edge.line = CoordinateSystem.__correct_A4(edge.line)
+			piece.edges = piece.edges.transform(CoordinateSystem.__A4_MATRIX)
 
 			if piece.placed_piece is not None:
 				piece.placed_piece.polygon = CoordinateSystem.__correct_A5(piece.placed_piece.polygon)
-
-				for edge in piece.placed_piece.edges:
-					edge.line = CoordinateSystem.__correct_A5(edge.line)
+				piece.placed_piece.edges = piece.placed_piece.edges.transform(CoordinateSystem.__A5_MATRIX)
 
 	@staticmethod
 	def __correct_A4(geometry):
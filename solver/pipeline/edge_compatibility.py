@@ -0,0 +1,49 @@
+from typing import List
+import numpy as np
+
+from solver.models.piece import Piece
+import solver.constants as constants
+
+
+A5_LONG_SIDE_PIXEL = max(constants.A5_WIDTH_MICROMETER, constants.A5_HEIGHT_MICROMETER) / constants.PIXEL_TO_MICROMETER_FACTOR
+# edges longer than the A5 side by this factor can't lie on one side together
+LENGTH_TOLERANCE_FACTOR = 0.25
+# interior angle difference at which angles no longer fit
+ANGLE_TOLERANCE_DEGREES = 90.0
+CORNER_ANGLE_DEGREES = 90.0
+
+class EdgeCompatibility:
+	# how likely edge b of one piece follows edge a of another piece on the puzzle frame, 0 (never) to 1
+	# either both lie on the same frame side, then their lengths fit on the side and the cut between them has complementary angles
+	# or the frame turns between them, then one of them ends or starts at a piece corner
+	def __init__(self, pieces: List[Piece]):
+		lengths = np.concatenate([piece.edges.lengths for piece in pieces])
+		start_angles, end_angles = zip(*(piece.edges.interior_angles() for piece in pieces))
+		start_angles = np.concatenate(start_angles)
+		end_angles = np.concatenate(end_angles)
+
+		# first row and column of every piece
+		self.__offsets = np.cumsum([0] + [len(piece.edges) for piece in pieces])
+
+		same_side = EdgeCompatibility.__length_fit(lengths[:, None] + lengths[None, :]) * EdgeCompatibility.__angle_fit(end_angles[:, None] + start_angles[None, :], 180.0)
+		corner = np.maximum(EdgeCompatibility.__angle_fit(end_angles, CORNER_ANGLE_DEGREES)[:, None], EdgeCompatibility.__angle_fit(start_angles, CORNER_ANGLE_DEGREES)[None, :])
+		corner = corner * EdgeCompatibility.__length_fit(lengths)[:, None] * EdgeCompatibility.__length_fit(lengths)[None, :]
+
+		self.matrix = np.maximum(same_side, corner)
+
+	@staticmethod
+	def __length_fit(lengths: np.ndarray) -> np.ndarray:
+		tolerance = A5_LONG_SIDE_PIXEL * LENGTH_TOLERANCE_FACTOR
+
+		return np.clip(1 - (lengths - A5_LONG_SIDE_PIXEL) / tolerance, 0, 1)
+
+	@staticmethod
+	def __angle_fit(angles: np.ndarray, expected: float) -> np.ndarray:
+		return np.clip(1 - np.abs(angles - expected) / ANGLE_TOLERANCE_DEGREES, 0, 1)
+
+	def score(self, piece_a: int, edge_a: int, piece_b: int, edge_b: int) -> float:
+		return self.matrix[self.__offsets[piece_a] + edge_a, self.__offsets[piece_b] + edge_b]
+
+	def row(self, piece_a: int, edge_a: int, piece_b: int) -> np.ndarray:
+		# scores of every edge of piece b following edge a
+		return self.matrix[self.__offsets[piece_a] + edge_a, self.__offsets[piece_b]:self.__offsets[piece_b + 1]]
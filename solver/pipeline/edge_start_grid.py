@@ -0,0 +1,71 @@
+import math
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Tuple
+import numpy as np
+
+from solver.models.edge_table import EdgeTable
+
+
+Cell = Tuple[int, int]
+# (piece index, edge index)
+EdgeKey = Tuple[int, int]
+
+class EdgeStartGrid:
+	# spatial hash of the start points of all placed edges
+	# a cell is as large as the search radius, so every start point within the radius is in the 3x3 cells around a point
+	def __init__(self, cell_size: float):
+		self.__cell_size = cell_size
+		self.__cells: DefaultDict[Cell, List[EdgeKey]] = defaultdict(list)
+		self.__piece_cells: Dict[int, List[Cell]] = {}
+		# pieces are only hashed once a lookup needs them, most placements are removed again before that
+		self.__pending: Dict[int, EdgeTable] = {}
+
+	def __cell(self, x: float, y: float) -> Cell:
+		return math.floor(x / self.__cell_size), math.floor(y / self.__cell_size)
+
+	def add(self, piece_index: int, edges: EdgeTable):
+		self.__pending[piece_index] = edges
+
+	def __insert(self, piece_index: int, edges: EdgeTable):
+		cells: List[Cell] = [tuple(cell) for cell in np.floor(edges.points[:, 0] / self.__cell_size).astype(int).tolist()]
+
+		for edge_index, cell in enumerate(cells):
+			self.__cells[cell].append((piece_index, edge_index))
+
+		self.__piece_cells[piece_index] = cells
+
+	def remove(self, piece_index: int):
+		if self.__pending.pop(piece_index, None) is not None:
+			return
+
+		for cell in self.__piece_cells.pop(piece_index):
+			entries = [entry for entry in self.__cells[cell] if entry[0] != piece_index]
+
+			if entries:
+				self.__cells[cell] = entries
+			else:
+				del self.__cells[cell]
+
+	def clear(self):
+		self.__cells.clear()
+		self.__piece_cells.clear()
+		self.__pending.clear()
+
+	def near(self, x: float, y: float) -> List[EdgeKey]:
+		# candidates only, callers still check the exact distance
+		for piece_index, edges in self.__pending.items():
+			self.__insert(piece_index, edges)
+
+		self.__pending.clear()
+
+		cell_x, cell_y = self.__cell(x, y)
+		entries: List[EdgeKey] = []
+
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				entries.extend(self.__cells.get((cell_x + dx, cell_y + dy), ()))
+
+		# same order as scanning all placed pieces and their edges
+		entries.sort()
+
+		return entries
@@ -1,60 +1,357 @@
-import copy
+import heapq
+import itertools
 import math
-from typing import List, Optional
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, List, Optional, Set, Tuple, cast
 from shapely import Point
-from shapely.ops import unary_union
 from solver.debugger import Debugger
 from solver.models.piece import Piece
+from solver.models.placement import Placement
 from solver.models.solution import Solution
 from solver.models.cursor import Cursor
+from solver.models.edge_table import EDGE_TIER_FRAME, EDGE_TIERS
+from solver.pipeline.border_assembler import BorderAssembler
+from solver.pipeline.edge_compatibility import EdgeCompatibility
+from solver.pipeline.edge_start_grid import EdgeStartGrid
+from solver.pipeline.placement_scorer import PlacementScorer
+from solver.pipeline.raster_scorer import RasterScorer
 import solver.constants as constants
 
 
 PLACED_EDGE_START_MARGIN = 5.0
 PLACED_EDGE_ANGLE_MARGIN = 5.0
+MAX_CURSOR_CHAIN_DEPTH = 10
+CURSOR_POSITION_QUANTUM_PIXEL = 1.0
+CURSOR_ANGLE_QUANTUM_DEGREES = 0.5
 MAX_A5_OVERFLOW = 100.0
+MAX_EXTENT_PIXEL = constants.A5_WIDTH_MICROMETER * MAX_A5_OVERFLOW / constants.PIXEL_TO_MICROMETER_FACTOR
+# relative combined puzzle start point
+START_CURSOR = Cursor(Point(0, 0), 0)
+# nodes between two deadline checks in anytime mode
+DEADLINE_CHECK_INTERVAL = 64
+# the depth first search grows factorially, it only finishes in seconds up to the piece count of the test captures
+DEPTH_FIRST_FALLBACK_MAX_PIECES = 6
+# every n-th raster rejection is checked against the exact overlap to measure the false rejection rate
+RASTER_VERIFY_INTERVAL = 32
+# search engines
+# depth first backtracks recursively, best first expands the partial assembly with the lowest bound next
+# border first lays the frame pieces around the perimeter and fills the interior greedily, it scales to larger puzzles
+SEARCH_STRATEGY_DEPTH_FIRST = "depth-first"
+SEARCH_STRATEGY_BEST_FIRST = "best-first"
+SEARCH_STRATEGY_BORDER_FIRST = "border-first"
+SEARCH_STRATEGIES = [SEARCH_STRATEGY_DEPTH_FIRST, SEARCH_STRATEGY_BEST_FIRST, SEARCH_STRATEGY_BORDER_FIRST]
+# (piece, edge) pairs following the last placed edge below this compatibility are not tried
+# 0 never skips a pair, the compatibility then only orders the edges within each piece and the search stays exact
+# consecutive edges of the test-5 solution score 0.86-1.0, one capture is too little to back a cut above 0
+MIN_EDGE_COMPATIBILITY = 0.0
+# raster cell size of the overlap pre-filter, None scores every placement exactly
+# the raster overlap is an estimate, not a lower bound, so the filter can cut subtrees holding the best solution
+# off by default to keep the search exact, 16 px rejected most placements on test-5 with 2 of 1078 checked rejections false
+RASTER_CELL_PIXEL: Optional[float] = None
+# suggested cell size when the filter is turned on
+RASTER_CELL_SUGGESTED_PIXEL = 16.0
+
+# (branch index, first piece edge index, second placement, second cursor widened)
+Branch = Tuple[int, int, Placement, bool]
+# (best score, best placements, tried, expanded, pruned, reused, raster rejected, raster verified, raster false rejects, timed out)
+BranchResult = Tuple[float, Optional[List[Placement]], int, int, int, int, int, int, int, bool]
+
+# quantized cursor position and angle
+CursorKey = Tuple[int, int, int]
+# (cursor, piece index, edge index) of one placement step
+Step = Tuple[Cursor, int, int]
+# (lower bound, negative depth, insertion order, steps from the start) of a partial assembly in the best first queue
+QueueEntry = Tuple[float, int, int, Tuple[Step, ...]]
+
+# matcher of a pool worker process, created once per process
+_worker_matcher: Optional["Matcher"] = None
+
+def _init_worker(pieces: List[Piece], raster_cell_pixel: Optional[float], edge_tier: int, shared_best_score: Any, shared_optimal_branch: Any, deadline: Optional[float]):
+	global _worker_matcher
+	_worker_matcher = Matcher(pieces, raster_cell_pixel=raster_cell_pixel)
+	_worker_matcher.attach_worker(edge_tier, shared_best_score, shared_optimal_branch, deadline)
+
+def _search_branch(branch: Branch) -> BranchResult:
+	return cast(Matcher, _worker_matcher).search_branch(*branch)
 
 class Matcher:
-	def __init__(self, pieces: List[Piece]):
-		self.__pieces = pieces
-		self.__best_solution: Optional[Solution] = None
+	def __init__(self, pieces: List[Piece], workers: int = 1, raster_cell_pixel: Optional[float] = RASTER_CELL_PIXEL, strategy: str = SEARCH_STRATEGY_DEPTH_FIRST, beam_width: Optional[int] = None):
+		if strategy not in SEARCH_STRATEGIES:
+			raise ValueError(f"strategy must be one of {SEARCH_STRATEGIES!r}, got {strategy!r}")
 
-	def find_solution(self) -> Optional[Solution]:
+		self.__pieces = pieces
+		self.__strategy = strategy
+		# best first only, keeps at most this many partial assemblies queued, None keeps all and stays exact
+		self.__beam_width = beam_width
+		# search processes, second level branches are handed to a pool if more than one
+		self.__workers = workers
+		# best score of all workers, shared so every worker can prune with it
+		self.__shared_best_score: Any = None
+		# lowest branch index that found a score of 0, later branches can't win and stop
+		self.__shared_optimal_branch: Any = None
+		# index of the branch a pool worker searches
+		self.__branch_index = 0
+		# wall clock time (time.time) the search stops at in anytime mode
+		self.__deadline: Optional[float] = None
+		self.__timed_out = False
+		# current placement of every piece, mirrors piece.placed_piece
+		self.__placements: List[Optional[Placement]] = [None] * len(pieces)
+		# highest edge tier used as candidate, widened step by step while no solution is found
+		self.__edge_tier = EDGE_TIER_FRAME
+		# placements on the current path that were impossible before the last widening step
+		self.__widened_placements: List[bool] = []
+		# best solution is only recorded as placements and rebuilt once the search ends
+		self.__best_placements: Optional[List[Placement]] = None
+		self.__best_score = float("inf")
+		# overlap and bounds of the placed pieces, updated on every place and reset
+		self.__scorer = PlacementScorer(len(pieces))
+		# likelihood of every edge pair following each other on the frame, built once per solve
+		self.__compatibility = EdgeCompatibility(pieces)
+		# start points of placed edges, the cursor continues along edges starting next to it
+		self.__edge_starts = EdgeStartGrid(PLACED_EDGE_START_MARGIN)
+
+		# bounds for pruning partial placements
+		self.__total_area = sum(piece.polygon.area for piece in pieces)
+		# a placed piece lies within its bounding box diagonal of the cursor, which is at most a piece gap away from placed pieces
+		self.__piece_reach = [math.hypot(max_x - min_x, max_y - min_y) + constants.PIECE_MARGIN_PIXEL for min_x, min_y, max_x, max_y in (piece.polygon.bounds for piece in pieces)]
+
+		# coarse overlap estimate that rejects clearly worse placements before the exact overlap, None scores exactly
+		# all pieces lie within their summed reach of the start cursor
+		self.__raster_cell_pixel = raster_cell_pixel
+		self.__raster = None if raster_cell_pixel is None else RasterScorer([piece.polygon for piece in pieces], raster_cell_pixel, sum(self.__piece_reach))
+
+	def find_solution(self, budget: Optional[float] = None) -> Optional[Solution]:
+		# budget in seconds turns on anytime mode
+		# the search stops at the deadline and returns the best solution found so far, marked incomplete
 		if len(self.__pieces) <= 0:
 			return
 
-		Debugger.log("Start matching")
-		self.__verbose = False
+		self.__deadline = None if budget is None else time.time() + budget
+		self.__timed_out = False
+
+		for piece in self.__pieces:
+			piece.placement_cache.clear()
+
+		if self.__strategy == SEARCH_STRATEGY_BORDER_FIRST:
+			Debugger.log("Start border first assembly")
+			solution = BorderAssembler(self.__pieces, self.__deadline).find_solution()
+
+			if solution is not None:
+				self.__log_placement_cache()
+				Debugger.log(f"Found solution with score {solution.score}\n\n")
+				return solution
+
+			# irregular cuts can leave the frame without clear corners, the exhaustive search still finds a layout for small puzzles
+			if len(self.__pieces) > DEPTH_FIRST_FALLBACK_MAX_PIECES:
+				Debugger.log(f"Border first assembly found no complete layout, the depth first search can't finish above {DEPTH_FIRST_FALLBACK_MAX_PIECES} pieces\n\n")
+				return None
+
+			Debugger.log("Border first assembly found no complete layout, falling back to the depth first search")
+
+		Debugger.log("Start matching" if budget is None else f"Start matching with a budget of {budget:.2f}s")
+		self.__edge_tier = EDGE_TIER_FRAME
 		self.__run()
 
-		if self.__best_solution is None:
+		# widen the edge candidates tier by tier
+		# every step only searches placements that use the new tier, everything else failed in the narrower steps
+		for edge_tier in EDGE_TIERS[1:]:
+			if self.__best_placements is not None or self.__timed_out:
+				break
+
 			Debugger.log("No solution found")
-			Debugger.log("Start verbose matching")
-			self.__verbose = True
+
+			if not any((piece.edges.tiers == edge_tier).any() for piece in self.__pieces):
+				continue
+
+			Debugger.log(f"Start matching with edge tier {edge_tier}")
+			self.__edge_tier = edge_tier
 			self.__run()
 
-		if self.__best_solution is None:
+		if self.__timed_out:
+			Debugger.log("Matching budget exceeded, search is incomplete")
+
+		self.__log_placement_cache()
+
+		if self.__best_placements is None:
 			Debugger.log("Found no solution\n\n")
-		else:
-			Debugger.log(f"Found solution with score {self.__best_solution.score}\n\n")
+			return None
+
+		Debugger.log(f"Found solution with score {self.__best_score}\n\n")
+
+		return self.__build_solution(self.__best_placements, self.__best_score)
 
-		return self.__best_solution
+	def __log_placement_cache(self):
+		# pool workers place copies of the pieces, only placements of this process are counted
+		hits = sum(piece.placement_cache.hits for piece in self.__pieces)
+		misses = sum(piece.placement_cache.misses for piece in self.__pieces)
+		hit_rate = hits / (hits + misses) if hits + misses > 0 else 0.0
+
+		Debugger.log(f"Placement cache [HITS={hits}]\t[MISSES={misses}]\t[HIT RATE={hit_rate * 100:.1f}%]")
+
+	def __build_solution(self, placements: List[Placement], score: float) -> Solution:
+		for piece in self.__pieces:
+			piece.reset()
+
+		for placement in placements:
+			self.__pieces[placement.piece_index].place(placement.edge_index, Cursor(Point(placement.x, placement.y), placement.angle_degrees))
+
+		return Solution(self.__pieces, score, not self.__timed_out)
 
 	def __run(self):
 		self.__optimal_option_found = False
 		self.__combinations_tried = 0
-		start = Cursor(Point(0, 0), 0)
-
-		# first piece is chosen to reduce calculations (else there would be multiple identical solutions)
-		for edge_index in range(len(self.__pieces[0].edges)):
-			if self.__verbose or self.__pieces[0].edges[edge_index].is_frame_edge:
+		self.__nodes_expanded = 0
+		self.__nodes_pruned = 0
+		self.__leaves_reused = 0
+		self.__raster_rejected = 0
+		self.__raster_verified = 0
+		self.__raster_false_rejects = 0
+
+		if self.__strategy == SEARCH_STRATEGY_BEST_FIRST:
+			self.__run_best_first()
+		elif self.__workers > 1 and len(self.__pieces) > 2:
+			self.__run_parallel()
+		else:
+			# first piece is chosen to reduce calculations (else there would be multiple identical solutions)
+			for edge_index in self.__first_edges():
 				# set relative combined puzzle start point
-				self.__place_next(start, 0, edge_index)
+				self.__place_next(START_CURSOR, 0, edge_index)
+
+		Debugger.log(f"Tried {self.__combinations_tried} combinations [{self.__nodes_expanded} expanded, {self.__nodes_pruned} pruned, {self.__leaves_reused} leaves skipped from narrower steps]")
+
+		if self.__raster is not None:
+			Debugger.log(f"Raster pre-filter [CELL={self.__raster.cell_size}px]\t[REJECTED={self.__raster_rejected}]\t[FALSE REJECTS={self.__raster_false_rejects}/{self.__raster_verified} checked]")
+
+	def __first_edges(self) -> List[int]:
+		return [edge_index for edge_index, tier in enumerate(self.__pieces[0].edges.tiers) if tier <= self.__edge_tier]
+
+	def __run_parallel(self):
+		# first level is expanded here, every second level node is searched by a pool worker
+		branches: List[Branch] = []
+
+		for edge_index in self.__first_edges():
+			self.__combinations_tried += 1
+			self.__nodes_expanded += 1
+			self.__place(START_CURSOR, 0, edge_index)
+
+			for cursor, piece_index, next_edge_index in self.__branches(self.__next_cursor(START_CURSOR, 0, edge_index), 0, edge_index):
+				branches.append((len(branches), edge_index, Placement(piece_index, next_edge_index, cursor.point.x, cursor.point.y, cursor.angle_degrees), cursor.widened))
+
+			self.__unplace(0)
+
+		Debugger.log(f"Searching {len(branches)} branches with {self.__workers} processes")
+
+		shared_best_score = multiprocessing.Value("d", self.__best_score)
+		shared_optimal_branch = multiprocessing.Value("i", len(branches))
+
+		with ProcessPoolExecutor(max_workers=self.__workers, initializer=_init_worker, initargs=(self.__pieces, self.__raster_cell_pixel, self.__edge_tier, shared_best_score, shared_optimal_branch, self.__deadline)) as executor:
+			# results arrive in branch order, ties keep the earlier branch like the serial search
+			# workers return solutions equal to the shared best score, so an earlier branch finishing later still reports its tie
+			for score, placements, tried, expanded, pruned, reused, rejected, verified, false_rejects, timed_out in executor.map(_search_branch, branches):
+				self.__timed_out = self.__timed_out or timed_out
+				self.__combinations_tried += tried
+				self.__nodes_expanded += expanded
+				self.__nodes_pruned += pruned
+				self.__leaves_reused += reused
+				self.__raster_rejected += rejected
+				self.__raster_verified += verified
+				self.__raster_false_rejects += false_rejects
+
+				if placements is not None and score < self.__best_score:
+					self.__best_placements = placements
+					self.__best_score = score
+
+	def attach_worker(self, edge_tier: int, shared_best_score: Any, shared_optimal_branch: Any, deadline: Optional[float]):
+		# turns this matcher into a pool worker, see _init_worker
+		self.__edge_tier = edge_tier
+		self.__shared_best_score = shared_best_score
+		self.__shared_optimal_branch = shared_optimal_branch
+		self.__deadline = deadline
+
+	def search_branch(self, branch_index: int, first_edge_index: int, second: Placement, widened: bool) -> BranchResult:
+		# searches the subtree below one second level placement in a pool worker
+		self.__branch_index = branch_index
+		self.__optimal_option_found = False
+		self.__best_placements = None
+		self.__best_score = float("inf")
+		self.__combinations_tried = 0
+		self.__nodes_expanded = 0
+		self.__nodes_pruned = 0
+		self.__leaves_reused = 0
+		self.__raster_rejected = 0
+		self.__raster_verified = 0
+		self.__raster_false_rejects = 0
+
+		self.__place(START_CURSOR, 0, first_edge_index)
+		self.__place_next(Cursor(Point(second.x, second.y), second.angle_degrees, widened), second.piece_index, second.edge_index)
+		self.__unplace(0)
+
+		return (self.__best_score, self.__best_placements, self.__combinations_tried, self.__nodes_expanded, self.__nodes_pruned, self.__leaves_reused, self.__raster_rejected, self.__raster_verified, self.__raster_false_rejects, self.__timed_out)
+
+	def __incumbent(self) -> float:
+		# best score known to this search, including other workers
+		if self.__shared_best_score is None:
+			return self.__best_score
+
+		# other workers' scores are only beaten or tied, the local best strictly beaten
+		# a tie found in an earlier branch must still reach the merge, which keeps the earliest branch
+		return min(self.__best_score, math.nextafter(self.__shared_best_score.value, math.inf))
+
+	def __is_stopped(self) -> bool:
+		# an earlier branch found an optimal solution, nothing in this branch can replace it
+		return self.__shared_optimal_branch is not None and self.__shared_optimal_branch.value < self.__branch_index
+
+	def __record(self, score: float):
+		self.__best_placements = cast(List[Placement], list(self.__placements))
+		self.__best_score = score
+
+		if self.__shared_best_score is not None:
+			with self.__shared_best_score.get_lock():
+				if score < self.__shared_best_score.value:
+					self.__shared_best_score.value = score
+
+		if score == 0 and self.__shared_optimal_branch is not None:
+			with self.__shared_optimal_branch.get_lock():
+				if self.__branch_index < self.__shared_optimal_branch.value:
+					self.__shared_optimal_branch.value = self.__branch_index
+
+	def __place(self, cursor: Cursor, piece_index: int, edge_index: int):
+		self.__pieces[piece_index].place(edge_index, cursor)
+		self.__placements[piece_index] = Placement(piece_index, edge_index, cursor.point.x, cursor.point.y, cursor.angle_degrees)
+		self.__widened_placements.append(self.__is_widened(cursor, piece_index, edge_index))
+		self.__scorer.push(self.__pieces[piece_index].placed_piece.polygon) # pyright: ignore[reportOptionalMemberAccess]
+		self.__edge_starts.add(piece_index, self.__pieces[piece_index].placed_piece.edges) # pyright: ignore[reportOptionalMemberAccess]
+
+		if self.__raster is not None:
+			self.__raster.push(piece_index, self.__pieces[piece_index].placed_piece.matrix) # pyright: ignore[reportOptionalMemberAccess]
+
+	def __unplace(self, piece_index: int):
+		self.__pieces[piece_index].reset()
+		self.__placements[piece_index] = None
+		self.__widened_placements.pop()
+		self.__scorer.pop()
+		self.__edge_starts.remove(piece_index)
 
-		Debugger.log(f"Tried {self.__combinations_tried} combinations")
+		if self.__raster is not None:
+			self.__raster.pop()
+
+	def __is_widened(self, cursor: Cursor, piece_index: int, edge_index: int) -> bool:
+		# placement that was no candidate before the current widening step
+		return self.__edge_tier > EDGE_TIER_FRAME and (cursor.widened or self.__pieces[piece_index].edges.tiers[edge_index] == self.__edge_tier)
+
+	def __next_cursor(self, cursor: Cursor, piece_index: int, edge_index: int) -> Cursor:
+		# continue at the end of the edge the piece was placed with
+		end_x, end_y = self.__pieces[piece_index].placed_piece.edges.points[edge_index, 1] # pyright: ignore[reportOptionalMemberAccess]
+		return Cursor(Point(end_x, end_y), cursor.angle_degrees)
 
 	def __place_next(self, cursor: Cursor, piece_index: int, edge_index: int):
-		if self.__optimal_option_found:
+		if self.__optimal_option_found or self.__timed_out or self.__is_stopped():
+			return
+
+		if self.__deadline is not None and self.__combinations_tried % DEADLINE_CHECK_INTERVAL == 0 and time.time() > self.__deadline:
+			self.__timed_out = True
 			return
 
 		# can't turn more than a full circle
@@ -62,64 +359,244 @@ class Matcher:
 			return
 
 		self.__combinations_tried += 1
-		self.__pieces[piece_index].place(edge_index, cursor)
+		self.__place(cursor, piece_index, edge_index)
 
 		# end reached -> evaluate solution
 		if all(piece.placed_piece is not None for piece in self.__pieces):
+			self.__evaluate_leaf()
+
+		# cut the subtree if no completion of this partial placement can beat the best solution
+		elif self.__lower_bound() >= self.__incumbent():
+			self.__nodes_pruned += 1
+
+		else:
+			self.__expand(self.__next_cursor(cursor, piece_index, edge_index), piece_index, edge_index)
+
+		# undo place after branching into every option is complete
+		# this ensures cleanup when backtracking
+		self.__unplace(piece_index)
+
+	def __evaluate_leaf(self):
+		# the bound rejects most leaves before the overlap is needed
+		if self.__lower_bound() < self.__incumbent():
 			score = self.__score_solution()
 
 			# potentially replace with new best solution
-			if score < float("inf"):
-				if self.__best_solution is None or score < self.__best_solution.score:
-					self.__best_solution = Solution(copy.deepcopy(self.__pieces), score)
+			if score < float("inf") and score < self.__incumbent():
+				self.__record(score)
+		else:
+			self.__nodes_pruned += 1
+
+	def __expand(self, next_cursor: Cursor, piece_index: int, edge_index: int):
+		self.__nodes_expanded += 1
+
+		for possible_cursor, next_piece_index, next_edge_index in self.__children(next_cursor, piece_index, edge_index):
+			self.__place_next(possible_cursor, next_piece_index, next_edge_index)
+
+	def __children(self, next_cursor: Cursor, piece_index: int, edge_index: int) -> List[Step]:
+		# branches are ordered gap cursor first, then pieces in order with the edges most compatible to the placed edge first
+		# in anytime mode this depth first order reaches good solutions early, sorting by lower bound was slower to converge
+		branches = self.__branches(next_cursor, piece_index, edge_index)
+
+		# leaves without any widened placement were already searched in a narrower step, none of them had a valid score
+		if self.__edge_tier > EDGE_TIER_FRAME and not any(self.__widened_placements) and sum(piece.placed_piece is None for piece in self.__pieces) == 1:
+			widened_branches = [branch for branch in branches if self.__is_widened(*branch)]
+			self.__leaves_reused += len(branches) - len(widened_branches)
+			branches = widened_branches
+
+		return branches
+
+	def __run_best_first(self):
+		# always expands the queued partial assembly with the lowest bound, deeper ones first on ties to reach a first solution early
+		# search is exact unless a beam width drops assemblies
+		queue: List[QueueEntry] = []
+		order = itertools.count()
+
+		for edge_index in self.__first_edges():
+			self.__enqueue(queue, order, (), (START_CURSOR, 0, edge_index))
+
+		while queue and not self.__optimal_option_found:
+			if self.__deadline is not None and time.time() > self.__deadline:
+				self.__timed_out = True
+				break
+
+			bound, _, _, steps = heapq.heappop(queue)
 
+			# no queued assembly can beat the best solution anymore
+			if bound >= self.__incumbent():
+				self.__nodes_pruned += len(queue) + 1
+				break
+
+			# rebuild the assembly, only its placements are queued
+			for step in steps:
+				self.__place(*step)
+
+			cursor, piece_index, edge_index = steps[-1]
+			next_cursor = self.__next_cursor(cursor, piece_index, edge_index)
+
+			self.__nodes_expanded += 1
+
+			for child in self.__children(next_cursor, piece_index, edge_index):
+				self.__enqueue(queue, order, steps, child)
+
+			for _, piece_index, _ in reversed(steps):
+				self.__unplace(piece_index)
+
+			if self.__beam_width is not None and len(queue) > self.__beam_width:
+				self.__nodes_pruned += len(queue) - self.__beam_width
+				# a sorted list is a valid heap
+				queue = heapq.nsmallest(self.__beam_width, queue)
+
+	def __enqueue(self, queue: List[QueueEntry], order: Iterator[int], steps: Tuple[Step, ...], step: Step):
+		cursor, piece_index, _ = step
+
+		# can't turn more than a full circle
+		if cursor.angle_degrees > 360:
 			return
 
-		edge = self.__pieces[piece_index].placed_piece.edges[edge_index] # pyright: ignore[reportOptionalMemberAccess]
-		cursor.point = Point(edge.endX, edge.endY)
+		self.__combinations_tried += 1
+		self.__place(*step)
+
+		if all(piece.placed_piece is not None for piece in self.__pieces):
+			self.__evaluate_leaf()
+		else:
+			bound = self.__lower_bound()
+
+			if bound >= self.__incumbent():
+				self.__nodes_pruned += 1
+			else:
+				heapq.heappush(queue, (bound, -len(steps) - 1, next(order), steps + (step,)))
+
+		self.__unplace(piece_index)
+
+	def __branches(self, next_cursor: Cursor, piece_index: int, edge_index: int) -> List[Step]:
+		# (compatibility, piece index, edge index) of every candidate following the placed edge
+		# pieces stay in order, each with its most compatible edges first and its longest edges first on ties
+		candidates: List[Tuple[float, int, int]] = []
+
+		for next_piece_index, piece in enumerate(self.__pieces):
+			if piece.placed_piece is None:
+				compatibilities = self.__compatibility.row(piece_index, edge_index, next_piece_index)
+
+				for next_edge_index, (tier, compatibility) in enumerate(zip(piece.edges.tiers, compatibilities.tolist())):
+					if tier <= self.__edge_tier and compatibility >= MIN_EDGE_COMPATIBILITY:
+						candidates.append((compatibility, next_piece_index, next_edge_index))
+
+		candidates.sort(key=lambda candidate: (candidate[1], -candidate[0]))
+
+		branches: List[Step] = []
 
 		# branch into every possible cursor position
 		# cursor can recursively move along already placed edges from current or other pieces
 		possible_cursors: List[Cursor] = []
-		possible_cursors.append(self.__move_to_piece_gap(cursor, False))
-		possible_cursors.append(self.__move_to_piece_gap(cursor, True))
-		possible_cursors.extend(self.__get_all_possible_cursors(cursor))
-
-		for cursor in possible_cursors:
-			# branch into each edge of each remaining edge
-			for piece_index, piece in enumerate(self.__pieces):
-				if piece.placed_piece is None:
-					for edge_index, edge in enumerate(piece.edges):
-						if self.__verbose or edge.is_frame_edge:
-							self.__place_next(cursor, piece_index, edge_index)
+		possible_cursors.append(self.__move_to_piece_gap(next_cursor, False))
+		possible_cursors.append(self.__move_to_piece_gap(next_cursor, True))
+		possible_cursors.extend(self.__get_all_possible_cursors(next_cursor, seen={self.__cursor_key(cursor) for cursor in [next_cursor, *possible_cursors]}))
 
-		# undo place after branching into every option is complete
-		# this ensures cleanup when backtracking
-		self.__pieces[piece_index].reset()
+		for possible_cursor in possible_cursors:
+			# branch into each candidate edge of each remaining piece
+			for _, next_piece_index, next_edge_index in candidates:
+				branches.append((possible_cursor, next_piece_index, next_edge_index))
+
+		return branches
+
+	def __lower_bound(self) -> float:
+		# lowest score any completion of the current partial placement can reach
+		# bounding box and overlap only grow when more pieces are placed
+		remaining_reach = sum(reach for piece, reach in zip(self.__pieces, self.__piece_reach) if piece.placed_piece is None)
 
-	def __get_all_possible_cursors(self, cursor: Cursor, depth: int = 1) -> List[Cursor]:
-		if depth > 10:
+		min_x, min_y, max_x, max_y = self.__scorer.bounds
+		width = max_x - min_x
+		height = max_y - min_y
+
+		if max(width, height) > MAX_EXTENT_PIXEL:
+			return float("inf")
+
+		bounding_area = width * height
+		# every remaining piece widens the bounding box by at most its reach
+		max_bounding_area = (width + remaining_reach) * (height + remaining_reach)
+
+		# final bounding area is at least the union area (total area minus overlap)
+		bound = max(
+			bounding_area - constants.A5_AREA_PIXEL,
+			self.__total_area - constants.A5_AREA_PIXEL,
+			constants.A5_AREA_PIXEL - max_bounding_area,
+		)
+
+		# cheap bounds first, the overlap needs polygon intersections
+		if bound >= self.__incumbent() or len(self.__scorer) < 2:
+			return bound
+
+		bounding_excess = max(bounding_area - constants.A5_AREA_PIXEL, 0.0)
+
+		if self.__raster is not None and self.__raster_rejects(bounding_excess):
+			# estimate only, not a strict bound, a rejected subtree may still hold a better solution
+			return max(bound, self.__raster.overlap_area + bounding_excess)
+
+		return max(bound, self.__scorer.overlap_area + bounding_excess)
+
+	def __raster_rejects(self, bounding_excess: float) -> bool:
+		if self.__raster.overlap_area + bounding_excess < self.__incumbent(): # pyright: ignore[reportOptionalMemberAccess]
+			return False
+
+		self.__raster_rejected += 1
+
+		# sample rejections against the exact overlap
+		if self.__raster_rejected % RASTER_VERIFY_INTERVAL == 0:
+			self.__raster_verified += 1
+
+			if self.__scorer.overlap_area + bounding_excess < self.__incumbent():
+				self.__raster_false_rejects += 1
+
+		return True
+
+	def __get_all_possible_cursors(self, cursor: Cursor, depth: int = 1, seen: Optional[Set[CursorKey]] = None) -> List[Cursor]:
+		if depth > MAX_CURSOR_CHAIN_DEPTH:
 			return []
 
+		if seen is None:
+			seen = {self.__cursor_key(cursor)}
+
 		possible_cursors: List[Cursor] = []
 
-		# branch into potential edges of already placed pieces
-		for piece in self.__pieces:
-			if piece.placed_piece is not None:
-				for edge in piece.placed_piece.edges:
-					if self.__verbose or edge.is_frame_edge:
-						angle_delta = abs((edge.angle_degrees - cursor.angle_degrees + 180) % 360 - 180)
-
-						if math.hypot(cursor.point.x - edge.startX, cursor.point.y - edge.startY) <= PLACED_EDGE_START_MARGIN:
-							if angle_delta <= PLACED_EDGE_ANGLE_MARGIN:
-								next_cursor = Cursor(Point(edge.endX, edge.endY), cursor.angle_degrees)
-								possible_cursors.extend(self.__get_all_possible_cursors(next_cursor, depth + 1))
-							elif angle_delta - 90 <=PLACED_EDGE_ANGLE_MARGIN:
-								next_cursor = Cursor(Point(edge.endX, edge.endY), cursor.angle_degrees + 90)
-								possible_cursors.extend(self.__get_all_possible_cursors(next_cursor, depth + 1))
+		# branch into potential edges of already placed pieces starting near the cursor
+		for piece_index, edge_index in self.__edge_starts.near(cursor.point.x, cursor.point.y):
+			placed_edges = self.__pieces[piece_index].placed_piece.edges # pyright: ignore[reportOptionalMemberAccess]
+			tier = placed_edges.tiers[edge_index]
+
+			if tier <= self.__edge_tier:
+				(start_x, start_y), (end_x, end_y) = placed_edges.points[edge_index].tolist()
+
+				if math.hypot(cursor.point.x - start_x, cursor.point.y - start_y) <= PLACED_EDGE_START_MARGIN:
+					widened = cursor.widened or (self.__edge_tier > EDGE_TIER_FRAME and tier == self.__edge_tier)
+					angle_delta = abs((placed_edges.angles[edge_index] - cursor.angle_degrees + 180) % 360 - 180)
+
+					if angle_delta <= PLACED_EDGE_ANGLE_MARGIN:
+						next_cursor = Cursor(Point(end_x, end_y), cursor.angle_degrees, widened)
+					elif abs(angle_delta - 90) <= PLACED_EDGE_ANGLE_MARGIN:
+						next_cursor = Cursor(Point(end_x, end_y), cursor.angle_degrees + 90, widened)
+					else:
+						continue
+
+					# several edges and chains can end at the same cursor, each would search the same subtree
+					key = self.__cursor_key(next_cursor)
+					if key in seen:
+						continue
+
+					seen.add(key)
+					possible_cursors.append(next_cursor)
+					possible_cursors.extend(self.__get_all_possible_cursors(next_cursor, depth + 1, seen))
 
 		return possible_cursors
 
+	@staticmethod
+	def __cursor_key(cursor: Cursor) -> CursorKey:
+		return (
+			round(cursor.point.x / CURSOR_POSITION_QUANTUM_PIXEL),
+			round(cursor.point.y / CURSOR_POSITION_QUANTUM_PIXEL),
+			round(cursor.angle_degrees / CURSOR_ANGLE_QUANTUM_DEGREES),
+		)
+
 	# pieces have a certain gap between each other
 	# pieces can be placed in 0 or 90 degree angle (if edge is diagonal to frame corner)
 	def __move_to_piece_gap(self, cursor: Cursor, angled: bool) -> Cursor:
@@ -135,20 +612,17 @@ class Matcher:
 		if any(piece.placed_piece is None for piece in self.__pieces):
 			return float("inf")
 
-		polygons = [piece.placed_piece.polygon for piece in self.__pieces if piece.placed_piece is not None]
-		combined = unary_union(polygons)
-		min_x, min_y, max_x, max_y = combined.bounds
+		min_x, min_y, max_x, max_y = self.__scorer.bounds
 
 		width = max_x - min_x
 		height = max_y - min_y
 
 		# invalid if dimensions are far off
-		if max(width, height) > constants.A5_WIDTH_MICROMETER * MAX_A5_OVERFLOW / constants.PIXEL_TO_MICROMETER_FACTOR:
+		if max(width, height) > MAX_EXTENT_PIXEL:
 			return float("inf")
 
 		# get total overlap area
-		sum_area = sum(polygon.area for polygon in polygons)
-		overlap_area = sum_area - combined.area
+		overlap_area = self.__scorer.overlap_area
 
 		bounding_area = width * height
 		size_difference = abs(bounding_area - constants.A5_AREA_PIXEL)
@@ -1,14 +1,16 @@
 import numpy as np
+import shapely
 from typing import List, cast
 from shapely import Polygon
-from shapely.geometry import LineString
 from solver.debugger import Debugger
-from solver.models.edge import Edge
+from solver.models.edge_table import EdgeTable, EDGE_TIER_ANY, EDGE_TIER_FRAME, EDGE_TIER_INTERSECTING, EDGE_TIER_SHORT
 from solver.models.piece import Piece
 
 
 EDGE_SIMPLIFY_TOLERANCE = 10.0
 MIN_EDGE_LENGTH = 100
+# edges between this and MIN_EDGE_LENGTH are the first ones added when the matcher widens its candidates
+SHORT_EDGE_LENGTH = 50
 POLYGON_INTERSECT_SHRINK_FACTOR = -10
 
 class PieceDetector:
@@ -22,43 +24,53 @@ class PieceDetector:
 			edges = PieceDetector.__extract_edges(polygon)
 			pieces.append(Piece(polygon, edges))
 
-			Debugger.log(f"Piece with {len(polygon.exterior.coords)} points has {len(edges)} edges [{len(list(filter(lambda edge: edge.is_frame_edge, edges)))} frame edges]")
+			Debugger.log(f"Piece with {len(polygon.exterior.coords)} points has {len(edges)} edges [{int(edges.is_frame_edge.sum())} frame edges]")
 
 		Debugger.log("\n")
 
 		return pieces
 
 	@staticmethod
-	def __extract_edges(polygon: Polygon) -> List[Edge]:
-		edges: List[Edge] = []
-
+	def __extract_edges(polygon: Polygon) -> EdgeTable:
 		simplified = polygon.simplify(EDGE_SIMPLIFY_TOLERANCE, preserve_topology=True)
-		coords = list(cast(Polygon, simplified).exterior.coords)
+		coords = shapely.get_coordinates(cast(Polygon, simplified).exterior)
 
-		for i in range(len(coords) - 1):
-			edge = Edge(LineString([coords[i], coords[i + 1]]), True)
+		# one segment per consecutive coordinate pair, built as a single geometry array
+		segments = np.stack((coords[:-1], coords[1:]), axis=1)
+		lines = shapely.linestrings(segments)
+		lengths = shapely.length(lines)
 
-			# flag invalid edges
-			# matcher first tries to solve with only valid edges then with all
-			if edge.length < MIN_EDGE_LENGTH or PieceDetector.__extend_line(edge.line).intersects(polygon.buffer(POLYGON_INTERSECT_SHRINK_FACTOR)):
-				edge.is_frame_edge = False
+		# flag invalid edges
+		# matcher first tries to solve with only frame edges, then widens tier by tier
+		intersecting = np.zeros(len(segments), dtype=bool)
+		candidates = np.flatnonzero(lengths >= SHORT_EDGE_LENGTH)
 
-			edges.append(edge)
+		if len(candidates) > 0:
+			# buffer once per piece, prepared for the vectorized predicate
+			shrunk = polygon.buffer(POLYGON_INTERSECT_SHRINK_FACTOR)
+			shapely.prepare(shrunk)
 
-		# sort for performance
-		edges.sort(key=lambda edge: edge.length, reverse=True)
+			extended = PieceDetector.__extend_lines(segments[candidates])
+			intersecting[candidates] = shapely.intersects(extended, shrunk)
 
-		return edges
+		tiers = np.full(len(segments), EDGE_TIER_ANY, dtype=np.int8)
+		tiers[(lengths >= SHORT_EDGE_LENGTH) & intersecting] = EDGE_TIER_INTERSECTING
+		tiers[(lengths >= SHORT_EDGE_LENGTH) & ~intersecting] = EDGE_TIER_SHORT
+		tiers[(lengths >= MIN_EDGE_LENGTH) & ~intersecting] = EDGE_TIER_FRAME
+
+		# sort for performance
+		return EdgeTable(segments, tiers, lengths).sorted_by_length()
 
 	@staticmethod
-	def __extend_line(line: LineString, scale: float = 1e6) -> LineString:
-		p1, p2 = map(np.array, line.coords)
+	def __extend_lines(segments: np.ndarray, scale: float = 1e6) -> np.ndarray:
+		p1 = segments[:, 0]
+		p2 = segments[:, 1]
 
 		direction = p2 - p1
-		direction = direction / np.linalg.norm(direction)
+		direction = direction / np.linalg.norm(direction, axis=1, keepdims=True)
 
 		# extend both directions
 		new_p1 = p1 - direction * scale
 		new_p2 = p2 + direction * scale
 
-		return LineString([new_p1, new_p2])
+		return shapely.linestrings(np.stack((new_p1, new_p2), axis=1))
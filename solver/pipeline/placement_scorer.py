@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+import numpy as np
+import shapely
+from shapely import Geometry, Polygon
+
+
+Bounds = Tuple[float, float, float, float]
+
+class PlacementScorer:
+	# keeps overlap area and bounds of the placed pieces up to date while the matcher places and removes pieces
+	# pieces are removed in reverse placement order, as in a depth first search, so every level reuses the levels below
+	def __init__(self, capacity: int, local_unions: bool = False):
+		self.__polygons: List[Polygon] = []
+		# spread out layouts like a frame touch only a few earlier pieces, the union of those is much smaller than the whole level
+		# compact layouts touch every earlier piece, growing the cached union of the previous level is cheaper there
+		self.__local_unions = local_unions
+		self.__piece_bounds = np.empty((capacity, 4))
+		# running values after each placement
+		# overlap and union are only computed when asked for, most nodes are pruned by their bounds alone
+		self.__bounds: List[Bounds] = []
+		self.__overlap_areas: List[Optional[float]] = []
+		self.__unions: List[Optional[Geometry]] = []
+
+	def __len__(self) -> int:
+		return len(self.__polygons)
+
+	@property
+	def bounds(self) -> Bounds:
+		return self.__bounds[-1]
+
+	@property
+	def overlap_area(self) -> float:
+		# equals sum of areas minus union area of all placed pieces
+		if not self.__polygons:
+			return 0.0
+
+		return self.__overlap_area(len(self.__polygons) - 1)
+
+	def push(self, polygon: Polygon):
+		count = len(self.__polygons)
+		bounds = polygon.bounds
+
+		if count > 0:
+			min_x, min_y, max_x, max_y = self.__bounds[-1]
+			self.__bounds.append((min(bounds[0], min_x), min(bounds[1], min_y), max(bounds[2], max_x), max(bounds[3], max_y)))
+		else:
+			self.__bounds.append(bounds)
+
+		self.__piece_bounds[count] = bounds
+		self.__polygons.append(polygon)
+		self.__overlap_areas.append(None)
+		self.__unions.append(None)
+
+	def pop(self):
+		self.__polygons.pop()
+		self.__bounds.pop()
+		self.__overlap_areas.pop()
+		self.__unions.pop()
+
+	def __overlap_area(self, index: int) -> float:
+		overlap_area = self.__overlap_areas[index]
+
+		if overlap_area is None:
+			overlap_area = self.__added_overlap_area(index)
+
+			if index > 0:
+				overlap_area += self.__overlap_area(index - 1)
+
+			self.__overlap_areas[index] = overlap_area
+
+		return overlap_area
+
+	def __added_overlap_area(self, index: int) -> float:
+		# area of the piece at index inside the union of the pieces placed before it
+		if index == 0:
+			return 0.0
+
+		min_x, min_y, max_x, max_y = self.__piece_bounds[index]
+
+		# only pieces with overlapping bounding boxes can add overlap
+		placed_bounds = self.__piece_bounds[:index]
+		candidates = np.flatnonzero((placed_bounds[:, 0] <= max_x) & (placed_bounds[:, 2] >= min_x) & (placed_bounds[:, 1] <= max_y) & (placed_bounds[:, 3] >= min_y))
+
+		if len(candidates) == 0:
+			return 0.0
+
+		polygon = self.__polygons[index]
+
+		if len(candidates) == 1:
+			return polygon.intersection(self.__polygons[candidates[0]]).area
+
+		# several candidates may overlap each other
+		if self.__local_unions:
+			return shapely.intersection(polygon, shapely.union_all([self.__polygons[candidate] for candidate in candidates.tolist()])).area
+
+		# grow the union of the previous level by this piece instead
+		previous_union = self.__union(index - 1)
+		union = shapely.union(previous_union, polygon)
+		self.__unions[index] = union
+
+		return polygon.area + previous_union.area - union.area
+
+	def __union(self, index: int) -> Geometry:
+		union = self.__unions[index]
+
+		if union is None:
+			union = self.__polygons[0] if index == 0 else shapely.union(self.__union(index - 1), self.__polygons[index])
+			self.__unions[index] = union
+
+		return union
@@ -0,0 +1,66 @@
+import math
+from typing import List, Optional, Tuple
+import numpy as np
+import shapely
+from shapely import Polygon
+
+from solver.models.edge_table import EdgeTable
+
+
+class RasterScorer:
+	# estimates the overlap of the placed pieces on a coarse occupancy grid
+	# every piece is sampled once at the cell centers inside its source polygon, placing it only transforms the samples
+	# pieces are removed in reverse placement order, as in a depth first search, like in the placement scorer
+	def __init__(self, polygons: List[Polygon], cell_size: float, extent: float):
+		self.cell_size = cell_size
+		self.__samples = [RasterScorer.sample(polygon, cell_size) for polygon in polygons]
+		# grid centered at the start cursor, every placement lies within extent of it
+		self.__offset = math.ceil(extent / cell_size) + 1
+		self.__width = 2 * self.__offset + 1
+		self.__occupancy = np.zeros(self.__width * self.__width, dtype=np.int16)
+		# (piece index, matrix) of every placed piece in placement order
+		self.__placed: List[Tuple[int, np.ndarray]] = []
+		# grid cells of the pieces already drawn into the occupancy grid, pieces are only drawn when the overlap is asked for
+		self.__drawn: List[np.ndarray] = []
+		self.__overlap_areas: List[float] = []
+
+	@staticmethod
+	def sample(polygon: Polygon, cell_size: float) -> np.ndarray:
+		# centers of the grid cells inside the polygon
+		min_x, min_y, max_x, max_y = polygon.bounds
+		xs = np.arange(min_x + cell_size / 2, max_x, cell_size)
+		ys = np.arange(min_y + cell_size / 2, max_y, cell_size)
+		grid_x, grid_y = np.meshgrid(xs, ys)
+		inside = shapely.contains_xy(polygon, grid_x, grid_y)
+
+		return np.stack((grid_x[inside], grid_y[inside]), axis=1)
+
+	def __len__(self) -> int:
+		return len(self.__placed)
+
+	def push(self, piece_index: int, matrix: np.ndarray):
+		self.__placed.append((piece_index, matrix))
+
+	def pop(self):
+		self.__placed.pop()
+
+		if len(self.__drawn) > len(self.__placed):
+			self.__occupancy[self.__drawn.pop()] -= 1
+			self.__overlap_areas.pop()
+
+	@property
+	def overlap_area(self) -> float:
+		# samples of every piece that fall into cells of the pieces placed before it
+		while len(self.__drawn) < len(self.__placed):
+			piece_index, matrix = self.__placed[len(self.__drawn)]
+			cells = np.floor(EdgeTable.transform_points(self.__samples[piece_index], matrix) / self.cell_size).astype(np.intp)
+			cells = np.clip(cells + self.__offset, 0, self.__width - 1)
+			cells = cells[:, 1] * self.__width + cells[:, 0]
+
+			added_overlap_area = np.count_nonzero(self.__occupancy[cells]) * self.cell_size ** 2
+			self.__overlap_areas.append(added_overlap_area + (self.__overlap_areas[-1] if self.__overlap_areas else 0.0))
+			# several samples of a rotated piece can share a cell, the cell is still counted once
+			self.__occupancy[cells] += 1
+			self.__drawn.append(cells)
+
+		return self.__overlap_areas[-1] if self.__overlap_areas else 0.0
@@ -0,0 +1,138 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+from cv2.typing import MatLike
+import numpy as np
+from solver.debugger import Debugger
+
+
+CACHE_FILE = Path("data/threshold_cache.json")
+CACHE_SIZE = 16
+THRESHOLDS_PER_SIGNATURE = 3
+
+# lighting signature is a coarse normalized grey level histogram
+SIGNATURE_BINS = 16
+SIGNATURE_DECIMALS = 3
+SIGNATURE_TOLERANCE = 0.1
+
+Signature = Tuple[float, ...]
+# sweep scale followed by the expected piece counts, thresholds only carry over within one context
+Context = Tuple[int, ...]
+Key = Tuple[Context, Signature]
+
+class ThresholdCache:
+	def __init__(self, path: Path = CACHE_FILE, size: int = CACHE_SIZE):
+		self.__path = path
+		self.__size = size
+		# least recently used signature first
+		self.__entries: OrderedDict[Key, List[int]] = OrderedDict()
+		# score of the last full sweep per signature, cached thresholds are judged against it
+		self.__scores: Dict[Key, float] = {}
+		self.hits = 0
+		self.misses = 0
+
+		self.__load()
+
+	@staticmethod
+	def signature(gaussian_image: MatLike) -> Signature:
+		histogram = cv2.calcHist([gaussian_image], [0], None, [SIGNATURE_BINS], [0, 256]).ravel()
+		histogram = histogram / max(histogram.sum(), 1)
+
+		return tuple(round(float(value), SIGNATURE_DECIMALS) for value in histogram)
+
+	@staticmethod
+	def context(scale: int, piece_counts: Sequence[int]) -> Context:
+		# scores and winning thresholds differ between pyramid levels and expected piece counts
+		return (scale, *sorted(piece_counts))
+
+	def lookup(self, context: Context, signature: Signature) -> Tuple[List[int], Optional[float]]:
+		# cached thresholds, most recent winner first, and the score of the sweep that found them
+		key = self.__find(context, signature)
+
+		if key is None:
+			self.misses += 1
+			Debugger.log(f"Threshold cache miss [HITS={self.hits}]\t[MISSES={self.misses}]")
+			return [], None
+
+		self.hits += 1
+		self.__entries.move_to_end(key)
+		Debugger.log(f"Threshold cache hit {self.__entries[key]} [HITS={self.hits}]\t[MISSES={self.misses}]")
+
+		return list(self.__entries[key]), self.__scores.get(key)
+
+	def store(self, context: Context, signature: Signature, threshold: int, score: Optional[float] = None):
+		# score is only passed for full sweeps, accepted cached thresholds must not drift the reference
+		key = self.__find(context, signature)
+
+		if key is None:
+			key = (context, signature)
+			self.__entries[key] = []
+
+		if score is not None:
+			self.__scores[key] = score
+
+		# most recent winner is tried first
+		thresholds = [threshold] + [cached for cached in self.__entries[key] if cached != threshold]
+		self.__entries[key] = thresholds[:THRESHOLDS_PER_SIGNATURE]
+		self.__entries.move_to_end(key)
+
+		while len(self.__entries) > self.__size:
+			evicted, _ = self.__entries.popitem(last=False)
+			self.__scores.pop(evicted, None)
+
+		self.__save()
+
+	def __find(self, context: Context, signature: Signature) -> Optional[Key]:
+		best_key: Optional[Key] = None
+		best_distance = SIGNATURE_TOLERANCE
+
+		# closest known lighting within tolerance (L1 distance of the histograms)
+		for key in self.__entries:
+			if key[0] != context:
+				continue
+
+			distance = float(np.abs(np.subtract(key[1], signature)).sum())
+
+			if distance <= best_distance:
+				best_key = key
+				best_distance = distance
+
+		return best_key
+
+	def __load(self):
+		if not self.__path.is_file():
+			return
+
+		entries: OrderedDict[Key, List[int]] = OrderedDict()
+		scores: Dict[Key, float] = {}
+
+		# a malformed file is ignored as a whole, the next store overwrites it
+		try:
+			for entry in json.loads(self.__path.read_text())[-self.__size:]:
+				context = tuple(int(value) for value in entry["context"])
+				signature = tuple(float(value) for value in entry["signature"])
+
+				if len(signature) != SIGNATURE_BINS:
+					raise ValueError(f"signature has {len(signature)} bins, expected {SIGNATURE_BINS}")
+
+				key = (context, signature)
+				entries[key] = [int(threshold) for threshold in entry["thresholds"]]
+
+				# files written before scores were stored only have the absolute cutoff
+				if entry.get("score") is not None:
+					scores[key] = float(entry["score"])
+		except (OSError, ValueError, KeyError, TypeError, AttributeError):
+			Debugger.log(f"Ignoring unreadable threshold cache {self.__path}")
+			return
+
+		self.__entries = entries
+		self.__scores = scores
+
+	def __save(self):
+		entries = [{"context": list(key[0]), "signature": list(key[1]), "thresholds": thresholds, "score": self.__scores.get(key)} for key, thresholds in self.__entries.items()]
+
+		self.__path.parent.mkdir(parents=True, exist_ok=True)
+		self.__path.write_text(json.dumps(entries))
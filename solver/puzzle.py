@@ -4,6 +4,7 @@ from typing import Optional
 
 from solver.debugger import Debugger
 from solver.models.solution import Solution
+from solver.models.solve_options import SolveOptions
 from solver.pipeline.contour_detector import ContourDetector
 from solver.pipeline.coordinate_system import CoordinateSystem
 from solver.pipeline.matcher import Matcher
@@ -12,14 +13,17 @@ from solver.pipeline.piece_detector import PieceDetector
 
 class Puzzle:
 	@staticmethod
-	def solve(image) -> Optional[Solution]:
+	def solve(image, options: Optional[SolveOptions] = None) -> Optional[Solution]:
 		if image is None:
 			raise FileNotFoundError("No image loaded to solve")
 
+		if options is None:
+			options = SolveOptions()
+
 		total_start_time = time.time()
 
 		contour_start_time = time.time()
-		polygons = ContourDetector.detect(image)
+		polygons = ContourDetector.detect(image, options.threshold_strategy, options.threshold_workers, options.pyramid_levels, options.warm_start, options.roi_capture, options.piece_counts)
 		contour_delta_time = time.time() - contour_start_time
 
 		match_start_time = time.time()
@@ -27,7 +31,7 @@ class Puzzle:
 		piece_delta_time = time.time() - match_start_time
 
 		match_start_time = time.time()
-		solution = Matcher(pieces).find_solution()
+		solution = Matcher(pieces, options.matcher_workers, options.matcher_raster_cell, options.matcher_strategy, options.matcher_beam_width).find_solution(options.matcher_budget)
 		match_delta_time = time.time() - match_start_time
 
 		coordinate_start_time = time.time()
@@ -42,6 +46,6 @@ class Puzzle:
 		Debugger.log(f"\tMatcher took {match_delta_time:.4f}s")
 		Debugger.log(f"\tCoordinate took {coordinate_delta_time:.4f}s\n\n")
 
-		Debugger.plot(image, [] if solution is None else solution.pieces)
+		Debugger.plot(image, [] if solution is None else solution.pieces, options.roi_capture)
 
 		return solution
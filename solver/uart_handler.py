@@ -1,15 +1,23 @@
+import copy
 import time
 
-from typing import List
-from serial import Serial
+from typing import List, Optional, Union, cast
+from serial import Serial, serial_for_url
+from services.buffered_camera import BufferedCameraService
 from services.camera import CameraService
+from services.replay_camera import ReplayCameraService
 from solver.constants import *
 from solver.debugger import Debugger
 from solver.models.piece import Piece
+from solver.models.solve_options import SolveOptions
 from solver.puzzle import Puzzle
 
 
 RESET_COMMAND = "reset"
+# persistent camera frames older than this are not used for a solve
+FRAME_MAX_AGE = 1.0
+# seconds the matcher may search per solve unless the options set a budget, bounds how long the robot waits
+MATCHER_BUDGET = 30.0
 
 class UartHandler:
 	stream: Serial
@@ -33,8 +41,26 @@ class UartHandler:
 
 		return messages
 
-	def __init__(self, port: str, baudrate: int = 115200):
-		self.stream = Serial(port, baudrate)
+	def __init__(self, port: str, baudrate: int = 115200, options: Optional[SolveOptions] = None):
+		# accepts device paths and pyserial urls (e.g. socket:// or a pty for hardware-free runs)
+		self.stream = serial_for_url(port, baudrate)
+		# a copy, the budget default must not leak into the caller's options
+		self.options = SolveOptions() if options is None else copy.copy(options)
+
+		if self.options.matcher_budget is None:
+			self.options.matcher_budget = MATCHER_BUDGET
+
+		self.camera: Optional[BufferedCameraService] = None
+		# replays stay open between per-solve captures, a new replay would start at its first frame again
+		self.replay_camera: Optional[ReplayCameraService] = None
+
+		# open once and keep capturing, solves take the latest converged frame
+		if self.options.persistent_camera:
+			self.camera = BufferedCameraService(self.__create_camera)
+			self.camera.open()
+		elif self.options.replay_source is not None:
+			self.replay_camera = cast(ReplayCameraService, self.__create_camera())
+			self.replay_camera.open()
 
 		# wait for start
 		self.listen()
@@ -96,16 +122,55 @@ class UartHandler:
 		Debugger.log(f"Sending {message}")
 		self.stream.write(f"{message}\n".encode('utf-8'))
 
-	def __solve(self):
-		with CameraService() as cam:
-			_, image = cam.read()
-			Debugger.save_image(image)
+	def __create_camera(self) -> Union[CameraService, ReplayCameraService]:
+		roi = A4_ROI_PIXEL if self.options.roi_capture else None
 
-		solution = Puzzle.solve(image)
+		if self.options.replay_source is not None:
+			return ReplayCameraService(
+				self.options.replay_source,
+				frame_interval=self.options.replay_interval,
+				memory_map=self.options.replay_memory_map,
+				roi=roi,
+				luminance=self.options.roi_capture,
+			)
+
+		return CameraService(roi=roi, luminance=self.options.roi_capture)
+
+	def __solve(self):
+		if self.camera is not None:
+			success, image = self.camera.read(FRAME_MAX_AGE)
+
+			if not success:
+				Debugger.log(f"No camera frame available ({self.camera.last_error!r})")
+				return
+		elif self.replay_camera is not None:
+			success, image = self.replay_camera.read()
+
+			if not success:
+				Debugger.log("Replay has no frames left")
+				return
+		else:
+			with self.__create_camera() as cam:
+				_, image = cam.read()
+
+		Debugger.save_image(image)
+
+		# the capture thread would compete with the solver for the cpu
+		if self.camera is not None:
+			self.camera.pause()
+
+		try:
+			solution = Puzzle.solve(image, self.options)
+		finally:
+			if self.camera is not None:
+				self.camera.resume()
 
 		if solution is None:
 			return
 
+		if not solution.complete:
+			Debugger.log(f"Using best solution found within {self.options.matcher_budget}s")
+
 		# create message list
 		self.messages.extend(UartHandler.get_piece_messages(solution.pieces))
 		self.messages.append("finish")
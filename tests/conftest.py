@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import List
+
+import cv2
+from cv2.typing import MatLike
+import pytest
+from shapely import Polygon
+
+from solver.models.piece import Piece
+from solver.pipeline.contour_detector import ContourDetector
+from solver.pipeline.piece_detector import PieceDetector
+
+
+TEST_IMAGE = Path(__file__).parent.parent / "data" / "test-5.png"
+
+@pytest.fixture(scope="session")
+def test_image() -> MatLike:
+	return cv2.imread(str(TEST_IMAGE))
+
+@pytest.fixture(scope="session")
+def test_polygons(test_image: MatLike) -> List[Polygon]:
+	return ContourDetector.detect(test_image)
+
+@pytest.fixture
+def test_pieces(test_polygons: List[Polygon]) -> List[Piece]:
+	# pieces are placed by the matchers, every test gets its own
+	return PieceDetector.detect(test_polygons)
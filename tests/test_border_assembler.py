@@ -0,0 +1,107 @@
+import math
+import random
+import time
+from typing import List
+
+import numpy as np
+import pytest
+import shapely
+from shapely import Polygon, affinity
+
+from solver.pipeline.border_assembler import BorderAssembler
+from solver.pipeline.matcher import SEARCH_STRATEGY_BORDER_FIRST, Matcher
+from solver.pipeline.piece_detector import PieceDetector
+import solver.constants as constants
+
+
+A5_WIDTH_PIXEL = constants.A5_WIDTH_MICROMETER / constants.PIXEL_TO_MICROMETER_FACTOR
+A5_HEIGHT_PIXEL = constants.A5_HEIGHT_MICROMETER / constants.PIXEL_TO_MICROMETER_FACTOR
+# border first result on data/test-5.png
+TEST_SCORE = 123785.54168370948
+
+def frame_puzzle(rows: int, cols: int, seed: int, teeth: int = 3, amplitude: float = 18.0, jitter: float = 40.0) -> List[Polygon]:
+	# A5 sheet cut into a jittered grid with zigzag cuts, a piece gap cut away and every piece scattered at a random angle
+	rng = random.Random(seed)
+	nodes = {}
+
+	for row in range(rows + 1):
+		for col in range(cols + 1):
+			x = A5_WIDTH_PIXEL * col / cols + (rng.uniform(-jitter, jitter) if 0 < col < cols else 0.0)
+			y = A5_HEIGHT_PIXEL * row / rows + (rng.uniform(-jitter, jitter) if 0 < row < rows else 0.0)
+			nodes[row, col] = np.array((x, y))
+
+	cuts = {}
+
+	def cut(start, end) -> List[np.ndarray]:
+		# points from start up to, but without, end
+		if (end, start) in cuts:
+			return [nodes[start]] + cuts[end, start][:0:-1]
+
+		border = (start[0] == end[0] and start[0] in (0, rows)) or (start[1] == end[1] and start[1] in (0, cols))
+		direction = nodes[end] - nodes[start]
+		normal = np.array((-direction[1], direction[0])) / np.linalg.norm(direction)
+		points = [nodes[start]] + ([] if border else [nodes[start] + direction * step / (teeth * 2) + normal * (1 if step % 2 else -1) * amplitude * rng.uniform(0.6, 1.0) for step in range(1, teeth * 2)])
+		cuts[start, end] = points
+
+		return points
+
+	polygons = []
+
+	for row in range(rows):
+		for col in range(cols):
+			corners = [(row, col), (row, col + 1), (row + 1, col + 1), (row + 1, col)]
+			polygons.append(Polygon([point for start, end in zip(corners, corners[1:] + corners[:1]) for point in cut(start, end)]))
+
+	pieces = []
+
+	for index, polygon in enumerate(polygons):
+		others = shapely.union_all([other for other in polygons if other is not polygon])
+		polygon = polygon.difference(others.buffer(constants.PIECE_MARGIN_PIXEL / 2, join_style="mitre"))
+		polygon = max(shapely.get_parts(polygon), key=lambda part: part.area)
+		centroid = polygon.centroid
+		polygon = affinity.rotate(affinity.translate(polygon, -centroid.x, -centroid.y), rng.uniform(0, 360), origin=(0, 0))
+		pieces.append(affinity.translate(polygon, 400 + index % 6 * 700, 400 + index // 6 * 700))
+
+	rng.shuffle(pieces)
+
+	return pieces
+
+@pytest.mark.parametrize("rows, cols, seed", [(3, 3, 0), (3, 3, 1), (4, 6, 0), (4, 6, 1)])
+def test_lays_out_frame_puzzles(rows: int, cols: int, seed: int):
+	pieces = PieceDetector.detect(frame_puzzle(rows, cols, seed))
+
+	start = time.time()
+	solution = BorderAssembler(pieces).find_solution()
+	duration = time.time() - start
+
+	assert solution is not None
+	assert all(piece.placed_piece is not None for piece in solution.pieces)
+	# the cut sheet scores 0, a layout off by a fraction of a piece gap stays far below one percent of the sheet
+	assert solution.score < constants.A5_AREA_PIXEL * 0.01
+	assert duration < 10.0
+
+def test_frame_search_stops_at_the_deadline():
+	pieces = PieceDetector.detect(frame_puzzle(4, 6, 0))
+
+	start = time.time()
+	solution = BorderAssembler(pieces, start + 0.3).find_solution()
+
+	# the frame search is cut short, so any layout found is marked incomplete
+	assert solution is None or not solution.complete
+	assert time.time() - start < 5.0
+
+def test_no_depth_first_fallback_for_larger_puzzles():
+	# regular heptagons have no frame corners, the border first assembly fails at once
+	polygons = [Polygon([(index % 3 * 400 + 300 + 150 * math.cos(2 * math.pi * corner / 7), index // 3 * 400 + 300 + 150 * math.sin(2 * math.pi * corner / 7)) for corner in range(7)]) for index in range(9)]
+
+	start = time.time()
+	solution = Matcher(PieceDetector.detect(polygons), strategy=SEARCH_STRATEGY_BORDER_FIRST).find_solution()
+
+	assert solution is None
+	assert time.time() - start < 5.0
+
+def test_matches_the_test_capture_baseline(test_pieces):
+	solution = Matcher(test_pieces, strategy=SEARCH_STRATEGY_BORDER_FIRST).find_solution()
+
+	assert solution is not None
+	assert solution.score == pytest.approx(TEST_SCORE, abs=1e-6)
@@ -0,0 +1,35 @@
+import cv2
+from cv2.typing import MatLike
+import numpy as np
+import pytest
+
+from solver.pipeline.contour_detector import MORPHOLOGY_KERNEL, PYRAMID_TOLERANCE, STRATEGIES, ContourDetector
+
+
+def gaussian(image: MatLike) -> MatLike:
+	return cv2.GaussianBlur(cv2.cvtColor(ContourDetector.crop(image), cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+def test_shared_morphology_matches_morphology_per_threshold(test_image: MatLike):
+	gaussian_image = gaussian(test_image)
+	sweep_image = ContourDetector._ContourDetector__prepare_sweep(gaussian_image) # pyright: ignore[reportAttributeAccessIssue]
+
+	for threshold in range(256):
+		_, mask = cv2.threshold(gaussian_image, threshold, 255, cv2.THRESH_BINARY_INV)
+		mask = cv2.morphologyEx(cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPHOLOGY_KERNEL), cv2.MORPH_CLOSE, MORPHOLOGY_KERNEL)
+		_, shared_mask = cv2.threshold(sweep_image, threshold, 255, cv2.THRESH_BINARY_INV)
+
+		assert np.array_equal(mask, shared_mask), f"threshold {threshold}"
+
+def test_detects_the_test_pieces(test_polygons):
+	assert len(test_polygons) == 6
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_pyramid_pieces_match_the_full_resolution_pieces(test_image: MatLike, strategy: str):
+	full_resolution = ContourDetector.detect(test_image, strategy)
+	pyramid = ContourDetector.detect(test_image, strategy, pyramid_levels=1)
+
+	assert len(pyramid) == len(full_resolution)
+
+	for polygon in pyramid:
+		reference = max(full_resolution, key=lambda candidate: candidate.intersection(polygon).area)
+		assert polygon.symmetric_difference(reference).area / reference.area < PYRAMID_TOLERANCE
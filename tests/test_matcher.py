@@ -0,0 +1,60 @@
+from typing import List
+
+import numpy as np
+import pytest
+from shapely import Polygon
+
+from solver.models.edge_table import EDGE_TIER_FRAME, EDGE_TIER_SHORT, EdgeTable
+from solver.models.solution import Solution
+from solver.pipeline.matcher import Matcher
+from solver.pipeline.piece_detector import PieceDetector
+
+
+# depth first result on data/test-5.png
+TEST_SCORE = 160637.54870530783
+
+def matrices(solution: Solution) -> List[np.ndarray]:
+	return [piece.placed_piece.matrix for piece in solution.pieces] # pyright: ignore[reportOptionalMemberAccess]
+
+@pytest.fixture(scope="module")
+def serial_solution(test_polygons: List[Polygon]) -> Solution:
+	solution = Matcher(PieceDetector.detect(test_polygons)).find_solution()
+	assert solution is not None
+	return solution
+
+def test_depth_first_matches_the_baseline(serial_solution: Solution):
+	assert serial_solution.complete
+	assert serial_solution.score == pytest.approx(TEST_SCORE, abs=1e-6)
+
+def test_parallel_search_matches_the_serial_search(test_polygons: List[Polygon], serial_solution: Solution):
+	solution = Matcher(PieceDetector.detect(test_polygons), workers=2).find_solution()
+
+	assert solution is not None
+	assert solution.score == serial_solution.score
+	assert all(np.array_equal(parallel, serial) for parallel, serial in zip(matrices(solution), matrices(serial_solution)))
+
+def demoted_pieces(test_polygons: List[Polygon], flat: bool):
+	# four test pieces, the second without frame edges, so the frame edge step finds nothing and the search widens
+	pieces = PieceDetector.detect(test_polygons)[:4]
+
+	for index, piece in enumerate(pieces):
+		tiers = piece.edges.tiers.copy()
+
+		if index == 1:
+			tiers[tiers == EDGE_TIER_FRAME] = EDGE_TIER_SHORT
+
+		# a single pass over the widened candidates
+		if flat:
+			tiers[tiers <= EDGE_TIER_SHORT] = EDGE_TIER_FRAME
+
+		piece.edges = EdgeTable(piece.edges.points, tiers, piece.edges.lengths)
+
+	return pieces
+
+def test_widening_matches_a_single_pass_over_the_widened_edges(test_polygons: List[Polygon]):
+	widened = Matcher(demoted_pieces(test_polygons, False)).find_solution()
+	single_pass = Matcher(demoted_pieces(test_polygons, True)).find_solution()
+
+	assert widened is not None and single_pass is not None
+	assert widened.score == single_pass.score
+	assert all(np.array_equal(widened_matrix, single_pass_matrix) for widened_matrix, single_pass_matrix in zip(matrices(widened), matrices(single_pass)))
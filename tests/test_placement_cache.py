@@ -0,0 +1,37 @@
+from typing import List
+
+import numpy as np
+from shapely import Point
+
+from solver.models.cursor import Cursor
+from solver.models.piece import Piece
+
+
+def placed(piece: Piece, edge_index: int, cursor: Cursor):
+	piece.place(edge_index, cursor)
+	return piece.placed_piece.matrix, piece.placed_piece.edges.points # pyright: ignore[reportOptionalMemberAccess]
+
+def test_cached_placements_equal_uncached_ones(test_pieces: List[Piece]):
+	piece = test_pieces[0]
+	cursor = Cursor(Point(120.5, -40.25), 33.3)
+	uncached_matrix, uncached_points = placed(piece, 1, cursor)
+
+	moved_matrix, moved_points = placed(piece, 1, Cursor(Point(0, 0), 33.3))
+	cached_matrix, cached_points = placed(piece, 1, cursor)
+
+	assert piece.placement_cache.hits == 2
+	assert np.array_equal(cached_matrix, uncached_matrix)
+	assert np.array_equal(cached_points, uncached_points)
+	assert not np.array_equal(moved_matrix, uncached_matrix)
+
+def test_nearby_rotations_keep_their_own_entries(test_pieces: List[Piece]):
+	piece = test_pieces[0]
+
+	# both within one 0.5 degree step, they used to evict each other
+	for _ in range(3):
+		placed(piece, 1, Cursor(Point(0, 0), 90.1))
+		placed(piece, 1, Cursor(Point(0, 0), 90.2))
+
+	assert len(piece.placement_cache) == 2
+	assert piece.placement_cache.misses == 2
+	assert piece.placement_cache.hits == 4
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+import shapely
+from shapely import Polygon, affinity, box
+
+from solver.pipeline.placement_scorer import PlacementScorer
+
+
+def random_polygons(seed: int, count: int):
+	rng = random.Random(seed)
+	polygons = []
+
+	for _ in range(count):
+		polygon = Polygon([(0, 0), (rng.uniform(80, 160), 0), (rng.uniform(60, 160), rng.uniform(60, 160)), (0, rng.uniform(80, 160))])
+		polygon = affinity.rotate(polygon, rng.uniform(0, 360), origin=(0, 0))
+		polygons.append(affinity.translate(polygon, rng.uniform(0, 300), rng.uniform(0, 300)))
+
+	return polygons
+
+def formula(polygons):
+	# score terms as computed before the incremental scorer
+	union = shapely.union_all(polygons)
+	return sum(polygon.area for polygon in polygons) - union.area, union.bounds
+
+@pytest.mark.parametrize("local_unions", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_overlap_and_bounds_match_the_union(seed: int, local_unions: bool):
+	polygons = random_polygons(seed, 8)
+	scorer = PlacementScorer(len(polygons), local_unions)
+	placed = []
+	rng = random.Random(seed)
+
+	# depth first like the matcher, pieces are removed in reverse placement order
+	for polygon in polygons:
+		scorer.push(polygon)
+		placed.append(polygon)
+
+		if len(placed) > 2 and rng.random() < 0.3:
+			scorer.pop()
+			placed.pop()
+
+		overlap_area, bounds = formula(placed)
+
+		assert scorer.overlap_area == pytest.approx(overlap_area, abs=1e-6)
+		assert scorer.bounds == pytest.approx(bounds)
+
+def test_disjoint_pieces_have_no_overlap():
+	scorer = PlacementScorer(2)
+	scorer.push(box(0, 0, 10, 10))
+	scorer.push(box(20, 0, 30, 10))
+
+	assert scorer.overlap_area == 0.0
+	assert scorer.bounds == (0.0, 0.0, 30.0, 10.0)
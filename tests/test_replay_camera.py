@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from services import replay_camera
+from services.replay_camera import ReplayCameraService
+
+
+@pytest.fixture
+def source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(replay_camera, "CACHE_DIR", tmp_path / "cache")
+    directory = tmp_path / "frames"
+    directory.mkdir()
+    for index in range(3):
+        cv2.imwrite(str(directory / f"{index}.png"), np.full((8, 8, 3), index * 50, np.uint8))
+    return directory
+
+
+def replay(source: Path, **kwargs) -> list[int]:
+    with ReplayCameraService(source, loop=False, memory_map=True, **kwargs) as camera:
+        frames = []
+        while True:
+            success, frame = camera.read()
+            if not success:
+                return frames
+            frames.append(int(frame[0, 0, 0]))
+
+
+def test_memory_map_replays_the_images(source: Path):
+    assert replay(source) == [0, 50, 100]
+    assert replay(source) == [0, 50, 100]
+
+
+def test_memory_map_follows_deleted_images(source: Path):
+    replay(source)
+    (source / "2.png").unlink()
+
+    assert replay(source) == [0, 50]
+
+
+def test_memory_map_follows_replaced_images_with_older_mtimes(source: Path):
+    replay(source)
+    cv2.imwrite(str(source / "0.png"), np.full((8, 8, 3), 200, np.uint8))
+    os.utime(source / "0.png", (1, 1))
+
+    assert replay(source) == [200, 50, 100]
+
+
+def test_explicit_cache_file_follows_deleted_images(source: Path, tmp_path: Path):
+    cache_file = tmp_path / "frames.npy"
+    replay(source, cache_file=cache_file)
+    (source / "1.png").unlink()
+
+    assert replay(source, cache_file=cache_file) == [0, 100]
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from solver.pipeline.threshold_cache import SIGNATURE_BINS, ThresholdCache
+
+
+SIGNATURE = tuple([1.0 / SIGNATURE_BINS] * SIGNATURE_BINS)
+CONTEXT = ThresholdCache.context(1, [4, 6])
+
+def test_stored_thresholds_survive_a_reload(tmp_path: Path):
+	path = tmp_path / "cache.json"
+	ThresholdCache(path).store(CONTEXT, SIGNATURE, 100, 0.5)
+
+	assert ThresholdCache(path).lookup(CONTEXT, SIGNATURE) == ([100], 0.5)
+
+def test_thresholds_stay_within_their_scale_and_piece_counts(tmp_path: Path):
+	cache = ThresholdCache(tmp_path / "cache.json")
+	cache.store(CONTEXT, SIGNATURE, 100, 0.5)
+
+	assert cache.lookup(ThresholdCache.context(2, [4, 6]), SIGNATURE) == ([], None)
+	assert cache.lookup(ThresholdCache.context(1, [9, 12, 24]), SIGNATURE) == ([], None)
+
+@pytest.mark.parametrize("content", [
+	"not json",
+	"null",
+	"{}",
+	"[1, 2]",
+	'[{"thresholds": [100]}]',
+	'[{"context": [1, 4, 6], "signature": [0.5], "thresholds": [100]}]',
+	'[{"context": [1, 4, 6], "signature": null, "thresholds": [100]}]',
+])
+def test_malformed_files_are_ignored(tmp_path: Path, content: str):
+	path = tmp_path / "cache.json"
+	path.write_text(content)
+	cache = ThresholdCache(path)
+
+	assert cache.lookup(CONTEXT, SIGNATURE) == ([], None)
+
+	# the next store replaces the file
+	cache.store(CONTEXT, SIGNATURE, 100)
+	assert ThresholdCache(path).lookup(CONTEXT, SIGNATURE) == ([100], None)